@@ -9,16 +9,8 @@ st.set_page_config(
     layout='wide'
 )
 
-from src.config import MODEL_PATH, CLASS_MAP_JSON 
-from src.infer import ASLClassifier 
-from utils import (
-    about,
-    history,
-    live_camera,
-    sample_gestures,
-    upload_prediction,
-    word_maker
-)
+from src.registry import REGISTRY, get_classifier as registry_classifier
+from utils.startup import BackgroundLoader, timed, lazy_import, format_report
 
 # --------------------------
 # --- Sidebar Navigation ---
@@ -56,27 +48,68 @@ st.caption(
 # --------------------
 # --- Model Loader ---
 # --------------------
+def _log_model_event(event):
+    rss = [event.get("rss_before"), event.get("rss_after")]
+    delta = f", RSS {(rss[1] - rss[0]) / 1e6:+.0f} MB" if None not in rss else ""
+    print(f"[model] {event['event']} {event['model_path']} v{event['version']} "
+          f"in {event['load_seconds']:.2f}s{delta}")
+
+@st.cache_resource
+def register_model_hooks():
+    # Once per process; load_classifier may run again after a failed load
+    REGISTRY.add_hook(_log_model_event)
+
 @st.cache_resource
 def load_classifier():
-    return ASLClassifier(MODEL_PATH, CLASS_MAP_JSON)
+    # Loads in the background so pages without a model (Home, History, ...) render right away
+    register_model_hooks()
+    return BackgroundLoader(registry_classifier, "model_load")
 
-clf = load_classifier()
+def get_classifier():
+    loader = load_classifier()
+    try:
+        if not loader.ready():
+            with st.spinner("⚙️ Loading ASL Classifier... Please wait"):
+                loader.get()
+        loader.get()  # re-raise a failed first load
+    except Exception:
+        # Don't keep the failed loader cached: the next rerun tries again (e.g. once a model is trained)
+        load_classifier.clear()
+        raise
+    # Shared registry: reloads only if the model file changed on disk
+    return registry_classifier()
 
 # -------------------
 # --- Page Router ---
 # -------------------
+# (title, module, entry point, needs the classifier)
 page_map = {
-    "🏠 Home": ("About", about.show),
-    "📩 Upload Prediction": ("Upload Prediction", upload_prediction.pred),
-    "📷 Live Detection": ("Live Detection", lambda: live_camera.show(clf)),
-    "🔤 Word Maker": ("Word Maker", lambda: word_maker.show(clf)),
-    "🙌 Sample Gestures": ("Sample Gestures", sample_gestures.show),
-    "📑 History": ("History", history.show),
+    "🏠 Home": ("About", "utils.about", "show", False),
+    "📩 Upload Prediction": ("Upload Prediction", "utils.upload_prediction", "pred", False),
+    "📷 Live Detection": ("Live Detection", "utils.live_camera", "show", True),
+    "🔤 Word Maker": ("Word Maker", "utils.word_maker", "show", True),
+    "🙌 Sample Gestures": ("Sample Gestures", "utils.sample_gestures", "show", False),
+    "📑 History": ("History", "utils.history", "show", False),
 }
 st.divider()
 
-page_title, page_func = page_map[menu]
-page_func()
+load_classifier()
+with st.sidebar.expander("⏱️ Startup timings"):
+    st.code(format_report(), language=None)
+
+page_title, module_name, func_name, needs_clf = page_map[menu]
+with timed(f"page:{page_title}"):
+    page_func = getattr(lazy_import(module_name), func_name)
+    if needs_clf:
+        try:
+            clf = get_classifier()
+        except Exception as e:
+            st.warning("⚠️ Model not found. Train the model first (see README).")
+            st.exception(e)
+            st.stop()
+        page_func(clf)
+    else:
+        page_func()
 
 # --------------
 # --- Footer ---
@@ -0,0 +1,106 @@
+import threading
+import numpy as np
+
+from .config import TFLITE_NUM_THREADS, ONNX_INTRA_OP_THREADS, ONNX_INTER_OP_THREADS
+
+# ------------------------------------------------------------
+# Inference backends used by ASLClassifier.
+# Each backend maps a preprocessed (N, H, W, 3) float32 batch
+# to an (N, num_classes) float32 probability array.
+# ------------------------------------------------------------
+
+class KerasBackend:
+    name = "keras"
+
+    def __init__(self, model_path, input_shape):
+        import tensorflow as tf
+
+        self._tf = tf
+        self.model = tf.keras.models.load_model(str(model_path))
+
+        # Compiled inference path: traced once for any batch size, so single-sample
+        # calls skip the data adapter/callback setup done by `model.predict`.
+        self._infer = tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(None, *input_shape), dtype=tf.float32)],
+        )
+
+    def __call__(self, x):
+        return self._infer(self._tf.convert_to_tensor(x, dtype=self._tf.float32)).numpy()
+
+
+class TFLiteBackend:
+    name = "tflite"
+
+    def __init__(self, model_path, num_threads=None):
+        num_threads = num_threads or TFLITE_NUM_THREADS
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=str(model_path), num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._lock = threading.Lock()  # the interpreter is not thread-safe
+        self._refresh_details()
+
+    def _refresh_details(self):
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+
+    def _ensure_batch(self, n):
+        """Resize the input tensor when the batch size changes."""
+        if self._input["shape"][0] != n:
+            self.interpreter.resize_tensor_input(self._input["index"], [n, *self._input["shape"][1:]])
+            self.interpreter.allocate_tensors()
+            self._refresh_details()
+
+    def __call__(self, x):
+        with self._lock:
+            self._ensure_batch(len(x))
+
+            # Full-int8 models take quantized inputs and return quantized outputs
+            in_dtype = self._input["dtype"]
+            if in_dtype != np.float32:
+                scale, zero = self._input["quantization"]
+                info = np.iinfo(in_dtype)
+                x = np.clip(np.round(x / scale + zero), info.min, info.max).astype(in_dtype)
+
+            self.interpreter.set_tensor(self._input["index"], x)
+            self.interpreter.invoke()
+            y = self.interpreter.get_tensor(self._output["index"])
+
+            if self._output["dtype"] != np.float32:
+                scale, zero = self._output["quantization"]
+                y = (y.astype(np.float32) - zero) * scale
+            return y
+
+
+class ONNXBackend:
+    name = "onnx"
+
+    def __init__(self, model_path, intra_op_threads=None, inter_op_threads=None):
+        intra_op_threads = intra_op_threads or ONNX_INTRA_OP_THREADS
+        inter_op_threads = inter_op_threads or ONNX_INTER_OP_THREADS
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("❌ The onnx backend needs `pip install onnxruntime`.") from e
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if intra_op_threads:
+            opts.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            opts.inter_op_num_threads = inter_op_threads
+
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self.session.get_inputs()[0].name
+        self._output_name = self.session.get_outputs()[0].name
+
+    def __call__(self, x):
+        return self.session.run([self._output_name], {self._input_name: x})[0]
@@ -0,0 +1,306 @@
+import os
+import csv
+import glob
+import json
+import time
+import argparse
+import numpy as np
+import multiprocessing as mp
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .config import INFERENCE_MODEL_PATH, CLASS_MAP_JSON, BATCH_SIZE
+from .preprocess import preprocess
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+COLUMNS = ["path", "label", "confidence", "top_k", "error"]
+PROGRESS_EVERY = 2.0                    # seconds between progress lines per worker
+
+# -------------------------
+# Input listing
+# -------------------------
+def list_images(inputs):
+    """Sorted, de-duplicated image paths from directories (recursive), glob patterns and files."""
+    found = set()
+    for item in inputs:
+        p = Path(item)
+        if p.is_dir():
+            found.update(f for f in p.rglob("*") if f.suffix.lower() in IMAGE_EXTS and f.is_file())
+        elif p.is_file():
+            found.add(p)
+        else:
+            found.update(Path(f) for f in glob.glob(item, recursive=True)
+                         if Path(f).suffix.lower() in IMAGE_EXTS and Path(f).is_file())
+    return sorted(str(f) for f in found)
+
+# -------------------------
+# Result writers
+# -------------------------
+def _truncate_partial_line(path):
+    """Drop a half-written last line left by an interrupted run."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+class CSVWriter:
+    def __init__(self, path, resume=False):
+        exists = resume and path.exists() and path.stat().st_size > 0
+        if exists:
+            _truncate_partial_line(path)
+        self._f = open(path, "a" if exists else "w", newline="", encoding="utf-8")
+        self._w = csv.DictWriter(self._f, fieldnames=COLUMNS)
+        if not exists:
+            self._w.writeheader()
+
+    def write(self, rows):
+        self._w.writerows({**r, "top_k": json.dumps(r["top_k"])} for r in rows)
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+    @staticmethod
+    def read(path):
+        with open(path, newline="", encoding="utf-8") as f:
+            for r in csv.DictReader(f):
+                yield {**r, "top_k": json.loads(r["top_k"] or "[]"),
+                       "confidence": float(r["confidence"]) if r["confidence"] else None}
+
+class JSONLWriter:
+    def __init__(self, path, resume=False):
+        exists = resume and path.exists()
+        if exists:
+            _truncate_partial_line(path)
+        self._f = open(path, "a" if exists else "w", encoding="utf-8")
+
+    def write(self, rows):
+        self._f.writelines(json.dumps(r) + "\n" for r in rows)
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+    @staticmethod
+    def read(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+class ParquetWriter:
+    """
+    Parquet files can't be appended to: on resume the existing rows are copied
+    into a new file first, and the file is swapped in on close().
+    """
+    def __init__(self, path, resume=False):
+        pa, pq = _pyarrow()
+        self.path = path
+        self._tmp = path.with_suffix(path.suffix + ".tmp")
+        self._schema = pa.schema([
+            ("path", pa.string()), ("label", pa.string()), ("confidence", pa.float64()),
+            ("top_k", pa.string()), ("error", pa.string()),
+        ])
+        self._w = pq.ParquetWriter(self._tmp, self._schema)
+        if resume and path.exists():
+            self._w.write_table(pq.read_table(path, schema=self._schema))
+
+    def write(self, rows):
+        pa, _ = _pyarrow()
+        rows = [{**r, "top_k": json.dumps(r["top_k"])} for r in rows]
+        self._w.write_table(pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self):
+        self._w.close()
+        os.replace(self._tmp, self.path)
+
+    @staticmethod
+    def read(path):
+        _, pq = _pyarrow()
+        for r in pq.read_table(path).to_pylist():
+            yield {**r, "top_k": json.loads(r["top_k"] or "[]")}
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("❌ Parquet output needs pyarrow. Install it with `pip install pyarrow`.")
+    return pa, pq
+
+WRITERS = {".csv": CSVWriter, ".jsonl": JSONLWriter, ".parquet": ParquetWriter}
+
+def writer_class(path):
+    try:
+        return WRITERS[Path(path).suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported output format {Path(path).suffix!r}; use .csv, .jsonl or .parquet")
+
+def done_paths(path):
+    """Input paths already present in an output (or part) file."""
+    path = Path(path)
+    if not path.exists() or path.stat().st_size == 0:
+        return set()
+    cls = writer_class(path)
+    if cls is not ParquetWriter:
+        _truncate_partial_line(path)
+    return {r["path"] for r in cls.read(path)}
+
+# -------------------------
+# Prediction pipeline
+# -------------------------
+def _load(path):
+    """Decode + preprocess one file on a pool thread; returns (array, error)."""
+    try:
+        return preprocess(path)[0].copy(), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def predict_files(clf, files, writer, batch_size=BATCH_SIZE, threads=None, top_k=5, prefetch=2, progress=None):
+    """
+    Stream `files` through a decode thread pool and the batched classifier,
+    writing one row per file. Up to `prefetch` batches are decoded ahead of the
+    one on the model, so decoding and inference overlap.
+    """
+    batches = (files[i:i + batch_size] for i in range(0, len(files), batch_size))
+    done = 0
+    with ThreadPoolExecutor(max_workers=threads or os.cpu_count()) as pool:
+        pending = deque()
+
+        def _fill():
+            while len(pending) < prefetch + 1:
+                batch = next(batches, None)
+                if batch is None:
+                    return
+                pending.append((batch, [pool.submit(_load, f) for f in batch]))
+
+        _fill()
+        while pending:
+            batch, futures = pending.popleft()
+            _fill()
+            loaded = [f.result() for f in futures]
+            ok = [i for i, (x, _) in enumerate(loaded) if x is not None]
+
+            rows = [{"path": f, "label": None, "confidence": None, "top_k": [], "error": err}
+                    for f, (_, err) in zip(batch, loaded)]
+            if ok:
+                probs = clf.predict_probs(np.stack([loaded[i][0] for i in ok]))
+                for i, p in zip(ok, probs):
+                    result = clf.result(p)
+                    rows[i].update(label=result.label, confidence=result.confidence,
+                                   top_k=[[k, v] for k, v in result.top_k(top_k)])
+            writer.write(rows)
+
+            done += len(batch)
+            if progress:
+                progress(done, len(batch))
+    return done
+
+def _classifier(model, backend, num_threads):
+    from .infer import ASLClassifier
+    return ASLClassifier(model, CLASS_MAP_JSON, backend=backend, num_threads=num_threads)
+
+def _run_shard(files, out_path, options, shard=0):
+    """One worker: load a classifier and score `files` into `out_path`."""
+    clf = _classifier(options["model"], options["backend"], options["num_threads"])
+    writer = writer_class(out_path)(Path(out_path), resume=True)
+    start = last = time.time()
+
+    def _progress(done, _):
+        nonlocal last
+        now = time.time()
+        if now - last < PROGRESS_EVERY and done < len(files):
+            return
+        last = now
+        print(f"[worker {shard}] {done}/{len(files)} images ({done / max(now - start, 1e-9):.1f} img/s)", flush=True)
+
+    try:
+        return predict_files(clf, files, writer, batch_size=options["batch_size"],
+                             threads=options["threads"], top_k=options["top_k"], progress=_progress)
+    finally:
+        writer.close()
+
+def _part_path(out, shard):
+    return out.with_name(f"{out.stem}.part{shard}{out.suffix}")
+
+def run(inputs, out, workers=1, batch_size=BATCH_SIZE, threads=None, top_k=5,
+        model=INFERENCE_MODEL_PATH, backend=None, resume=False):
+    """
+    Score every image under `inputs` into `out`. With `workers` > 1 the files are
+    split across that many processes (each with its own model), which write part
+    files that are merged into `out` at the end. `resume` skips files already in
+    `out` or in part files left by an interrupted run.
+    """
+    out = Path(out)
+    writer_class(out)
+    files = list_images(inputs)
+    parts = sorted(out.parent.glob(f"{out.stem}.part*{out.suffix}"))
+
+    if resume:
+        skip = done_paths(out).union(*(done_paths(p) for p in parts))
+    else:
+        skip = set()
+        for p in parts + [out]:
+            p.unlink(missing_ok=True)
+    todo = [f for f in files if f not in skip]
+    print(f"🔍 {len(files)} images found, {len(files) - len(todo)} already scored, {len(todo)} to go")
+
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(workers, len(todo) or 1))
+    options = {
+        "model": str(model), "backend": backend, "batch_size": batch_size, "top_k": top_k,
+        "threads": threads or max(1, cpus // workers),
+        "num_threads": max(1, cpus // workers),
+    }
+
+    start = time.time()
+    if workers == 1:
+        scored = _run_shard(todo, out, options) if todo else 0
+    else:
+        shards = [todo[k::workers] for k in range(workers)]
+        ctx = mp.get_context("spawn")       # TensorFlow is not fork-safe
+        with ctx.Pool(workers) as pool:
+            scored = sum(pool.starmap(
+                _run_shard, [(shard, _part_path(out, k), options, k) for k, shard in enumerate(shards)]
+            ))
+
+    # Fold part files (from this run or an interrupted one) into the output
+    parts = sorted(out.parent.glob(f"{out.stem}.part*{out.suffix}"))
+    if parts:
+        cls = writer_class(out)
+        writer = cls(out, resume=True)
+        try:
+            for p in parts:
+                writer.write(list(cls.read(p)))
+        finally:
+            writer.close()
+        for p in parts:
+            p.unlink()
+
+    elapsed = time.time() - start
+    print(f"✅ Scored {scored} images in {elapsed:.1f}s ({scored / max(elapsed, 1e-9):.1f} img/s) -> {out}")
+    return scored
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a folder (or glob) of images with the ASL classifier.")
+    parser.add_argument("inputs", nargs="+", help="Image directories, glob patterns or files")
+    parser.add_argument("-o", "--out", type=Path, default=Path("predictions.csv"),
+                        help="Output file: .csv, .jsonl or .parquet")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, each with its own model")
+    parser.add_argument("--threads", type=int, default=None, help="Decode threads per worker")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--model", type=Path, default=INFERENCE_MODEL_PATH,
+                        help="Keras (.h5/.keras), TFLite or ONNX model")
+    parser.add_argument("--backend", choices=["keras", "tflite", "onnx"], default=None,
+                        help="Inferred from the model file extension if omitted")
+    parser.add_argument("--resume", action="store_true", help="Skip images already in the output")
+    args = parser.parse_args()
+
+    run(args.inputs, args.out, workers=args.workers, batch_size=args.batch_size, threads=args.threads,
+        top_k=args.top_k, model=args.model, backend=args.backend, resume=args.resume)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import time
+import threading
+import numpy as np
+
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from .config import BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_MAX_PENDING_PER_SESSION
+
+# ------------------------------------------------
+# Micro-batching scheduler shared by all sessions
+# ------------------------------------------------
+class BatchScheduler:
+    """
+    Collects single preprocessed frames from many sessions and runs them through
+    the classifier as one batch.
+
+    A batch is dispatched when `max_batch` frames are pending or the oldest one
+    has waited `max_wait_ms`. Sessions are drained round-robin, one frame per
+    session per turn, so a fast client can't starve the others; each session may
+    have at most `max_pending` frames queued and the oldest is cancelled on overflow.
+    """
+    def __init__(self, clf, max_batch=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS,
+                 max_pending=BATCH_MAX_PENDING_PER_SESSION):
+        self.clf = clf
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_pending = max_pending
+
+        self.batches = 0
+        self.frames = 0
+        self.cancelled = 0
+
+        self._queues = OrderedDict()    # session_id -> deque[(enqueued_at, x, future)]
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="asl-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, session_id, x):
+        """
+        Queue one preprocessed (H, W, 3) float32 frame; returns a Future that
+        resolves to its probability vector.
+        """
+        future = Future()
+        with self._cond:
+            queue = self._queues.setdefault(session_id, deque())
+            if len(queue) >= self.max_pending:
+                _, _, old = queue.popleft()
+                old.cancel()
+                self._pending -= 1
+                self.cancelled += 1
+            queue.append((time.perf_counter(), x, future))
+            self._pending += 1
+            self._cond.notify()
+        return future
+
+    def _oldest(self):
+        return min(q[0][0] for q in self._queues.values() if q)
+
+    def _take_batch(self):
+        """Round-robin one frame per session until the batch is full."""
+        batch = []
+        while len(batch) < self.max_batch and self._pending:
+            for session_id in list(self._queues):
+                queue = self._queues[session_id]
+                if queue:
+                    batch.append(queue.popleft())
+                    self._pending -= 1
+                    if len(batch) >= self.max_batch:
+                        break
+        # Drop idle sessions and rotate so the next batch starts with a different one
+        for session_id in [sid for sid, q in self._queues.items() if not q]:
+            del self._queues[session_id]
+        if self._queues:
+            self._queues.move_to_end(next(iter(self._queues)))
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Wait for a full batch, but no longer than max_wait for the oldest frame
+                while self._pending < self.max_batch:
+                    remaining = self._oldest() + self.max_wait - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take_batch()
+
+            if not batch:
+                continue
+            x = np.stack([item[1] for item in batch])
+            try:
+                probs = self.clf.predict_probs(x)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.frames += len(batch)
+            for (_, _, future), p in zip(batch, probs):
+                future.set_result(p)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "frames": self.frames,
+            "mean_batch": self.frames / self.batches if self.batches else 0.0,
+            "cancelled": self.cancelled,
+            "sessions": len(self._queues),
+        }
+
+_SCHEDULER = None
+_SCHEDULER_LOCK = threading.Lock()
+
+def shared_scheduler(clf):
+    """The process-wide scheduler, pointed at `clf` (follows model reloads)."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = BatchScheduler(clf)
+        elif _SCHEDULER.clf is not clf:
+            _SCHEDULER.clf = clf
+        return _SCHEDULER
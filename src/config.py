@@ -10,6 +10,8 @@ TEST_DIR       = DATA_ROOT / "asl_alphabet_test"
 OUTPUT_DIR     = Path("saved_models")
 CLASS_MAP_JSON = OUTPUT_DIR / "class_names.json"
 MODEL_PATH     = OUTPUT_DIR / "asl_mobilenetv2.h5"
+TFLITE_MODEL_PATH = OUTPUT_DIR / "asl_mobilenetv2.tflite"
+ONNX_MODEL_PATH   = OUTPUT_DIR / "asl_mobilenetv2.onnx"
 
 # ------------------------
 # TRAINING HYPERPARAMETERS
@@ -21,6 +23,13 @@ LEARNING_RATE  = 1e-3
 VAL_SPLIT      = 0.1            # Fraction of train data for validation
 SEED           = 42             # For reproducibility
 
+# -----------------
+# INPUT PIPELINE
+# -----------------
+DATA_CACHE     = "disk"         # disk (uint8 files in DATA_CACHE_DIR) | memory (uint8) | none
+DATA_CACHE_DIR = Path(".cache/tfdata")
+SHUFFLE_BUFFER_BYTES = 1 << 30  # Training shuffle buffer budget (~14k uint8 images at 160x160)
+
 # -----------------
 # DATA AUGMENTATION
 # ----------------
@@ -34,3 +43,78 @@ H_FLIP         = True           # Random horizontal flip
 # MISC SETTINGS
 # --------------
 MIXED_PRECISION = False         # Set True if GPU supports Automatic Mixed Precision (AMP)
+
+# -----------------
+# INFERENCE / EXPORT
+# -----------------
+INFERENCE_BACKEND   = "keras"   # keras | tflite | onnx (export the model first, see README)
+MODEL_PATHS = {
+    "keras":  MODEL_PATH,
+    "tflite": TFLITE_MODEL_PATH,
+    "onnx":   ONNX_MODEL_PATH,
+}
+INFERENCE_MODEL_PATH = MODEL_PATHS[INFERENCE_BACKEND]
+
+TFLITE_NUM_THREADS  = None      # TFLite interpreter threads (None = runtime default)
+CALIBRATION_SAMPLES = 10        # Images per class used to calibrate full-int8 quantization
+ONNX_INTRA_OP_THREADS = None    # Threads used inside a single op (None = physical cores)
+ONNX_INTER_OP_THREADS = 1       # Threads across independent ops (MobileNetV2 is a chain, 1 is enough)
+ONNX_OPSET          = 13
+
+# ----------------------
+# LIVE STREAM BATCHING
+# ----------------------
+BATCH_MAX_SIZE      = 16        # Max frames (across all sessions) per forward pass
+BATCH_MAX_WAIT_MS   = 15        # Max time the oldest frame waits for a batch to fill
+BATCH_MAX_PENDING_PER_SESSION = 2   # Older frames from the same session are dropped beyond this
+
+# ----------------------
+# LIVE STREAM SMOOTHING
+# ----------------------
+SMOOTHING_ALPHA        = 0.4    # EMA weight of the newest probability vector
+STABLE_FRAMES          = 5      # Consecutive agreeing predictions before a letter is stable
+STABLE_MIN_CONFIDENCE  = 0.6    # Smoothed confidence required for a stable letter
+DRIFT_THRESHOLD        = 0.5    # Total-variation distance that releases a stable letter
+STREAM_SAMPLE_INTERVAL = 0.0    # Seconds between sampled frames while searching
+STABLE_SAMPLE_INTERVAL = 0.5    # Seconds between sampled frames while a letter is held
+
+# ----------------------
+# LIVE STREAM GATING
+# ----------------------
+FRAME_GATING           = False      # Skip the model on unchanged frames (opt-in, like HAND_CROP)
+GATE_SKIN_CHECK        = False      # Also treat frames with little skin-coloured area as "nothing" (not validated across lighting / skin tones)
+GATE_SIZE              = (64, 48)   # Thumbnail size used for differencing / skin area
+GATE_MOTION_THRESHOLD  = 0.02       # Mean abs. gray difference (0-1) below which a frame is "unchanged"
+GATE_MIN_SKIN_FRACTION = 0.02       # Minimum skin-coloured area for a frame to contain a hand
+GATE_REFRESH_SECONDS   = 2.0        # Re-run the model at least this often on unchanged frames
+
+# ----------------------
+# HAND CROPPING
+# ----------------------
+HAND_CROP           = False     # Crop to the detected hand before classification
+HAND_DETECT_WIDTH   = 160       # Width of the downsampled frame used for hand detection
+HAND_PADDING        = 0.25      # Extra margin around the hand box (fraction of its size)
+HAND_MIN_AREA       = 0.01      # Minimum blob area (fraction of the frame) to count as a hand
+HAND_REDETECT_EVERY = 5         # Live streams: re-detect every N frames, reuse the box in between
+HAND_BOX_SMOOTHING  = 0.5       # Weight of the previous box when blending in a new detection
+
+# ----------------------
+# WORD MAKER DICTIONARY
+# ----------------------
+DICTIONARY_SOURCE   = "auto"    # auto (local, then remote) | local | remote | stub
+DICTIONARY_WORDS    = DATA_ROOT / "words.tsv"               # bundled word list: word<TAB>definition
+DICTIONARY_INDEX    = Path(".cache/dictionary.db")          # SQLite index + remote lookup cache
+DICTIONARY_URL      = "https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+DICTIONARY_TIMEOUT  = 5.0       # Seconds per remote request
+DICTIONARY_RETRY_AFTER = 300    # After a failed request, skip the remote source for this long
+DICTIONARY_TTL      = 30 * 24 * 3600    # Seconds a remote meaning stays cached
+DICTIONARY_MISS_TTL = 24 * 3600         # Seconds a remote "no such word" stays cached
+
+# ----------------------
+# WORD MAKER SPELLING
+# ----------------------
+SPELL_BEAM_WIDTH    = 32        # Prefixes kept per letter position
+SPELL_TOP_N         = 5         # Candidate words shown to the user
+SPELL_LM_WEIGHT     = 0.5       # Weight of the letter bigram prior vs. classifier log-probs
+SPELL_OOV_PENALTY   = -6.0      # Log-score penalty for an out-of-lexicon signed word, scaled by (1 - its least confident letter)
+SPELL_MIN_MARGIN    = 2.0       # A lexicon word must beat the signed word by this log-score (~7x) to be suggested instead
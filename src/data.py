@@ -1,19 +1,25 @@
+import hashlib
+import numpy as np
 import tensorflow as tf
 
-from .config import TRAIN_DIR, TEST_DIR, IMAGE_SIZE, BATCH_SIZE, VAL_SPLIT, SEED
+from .config import (
+    TRAIN_DIR, TEST_DIR, IMAGE_SIZE, BATCH_SIZE, VAL_SPLIT, SEED,
+    DATA_CACHE, DATA_CACHE_DIR, SHUFFLE_BUFFER_BYTES
+)
+from .preprocess import standardize_tf
 from typing import Tuple, List, Optional
 
 AUTOTUNE = tf.data.AUTOTUNE
+IMAGE_EXTS = (".bmp", ".gif", ".jpeg", ".jpg", ".png")     # same set as image_dataset_from_directory
 
 # -------------------------
 # Preprocessing Helpers
 # -------------------------
 def _standardize(x: tf.Tensor) -> tf.Tensor:
     """
-    Normalize images to [-1, 1] range for MobileNetV2.
+    Normalize images to [-1, 1] range for MobileNetV2 (shared with serving, see src/preprocess.py).
     """
-    x = tf.cast(x, tf.float32) / 255.0
-    return (x - 0.5) * 2.0
+    return standardize_tf(x)
 
 
 def _has_class_subdirs(path: str) -> bool:
@@ -31,69 +37,123 @@ def _has_class_subdirs(path: str) -> bool:
     except Exception:
         return False
 
+
+def _list_files(root: str, class_names: Optional[List[str]] = None) -> Tuple[List[str], List[int], List[str]]:
+    """
+    Walk `root` once: (file paths, integer labels, class names), with classes
+    being the sorted subfolder names and files sorted within each class.
+    """
+    root = str(root)
+    if class_names is None:
+        class_names = sorted(
+            d.rstrip("/") for d in tf.io.gfile.listdir(root)
+            if tf.io.gfile.isdir(tf.io.gfile.join(root, d))
+        )
+    paths, labels = [], []
+    for label, name in enumerate(class_names):
+        class_dir = tf.io.gfile.join(root, name)
+        if not tf.io.gfile.isdir(class_dir):
+            continue
+        found = []
+        for dirpath, _, filenames in tf.io.gfile.walk(class_dir):
+            found += [tf.io.gfile.join(dirpath, f) for f in filenames if f.lower().endswith(IMAGE_EXTS)]
+        paths += sorted(found)
+        labels += [label] * len(found)
+    return paths, labels, class_names
+
+
+def _decode(path: tf.Tensor, label: tf.Tensor):
+    """Read + decode + area-resize one file to uint8 (rounded, like the cv2 path used at serving time)."""
+    img = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False)
+    img = tf.image.resize(img, IMAGE_SIZE, method="area")
+    img = tf.cast(tf.round(tf.clip_by_value(img, 0.0, 255.0)), tf.uint8)
+    img.set_shape((*IMAGE_SIZE, 3))
+    return img, label
+
+
+def _cache(ds: tf.data.Dataset, name: str, paths: List[str]) -> tf.data.Dataset:
+    """
+    Cache decoded uint8 images per DATA_CACHE. Disk caches are keyed on the
+    file list and image size, so a changed dataset or split gets a fresh cache.
+    """
+    if DATA_CACHE == "none":
+        return ds
+    if DATA_CACHE == "memory":
+        return ds.cache()
+    if DATA_CACHE != "disk":
+        raise ValueError(f"Unknown DATA_CACHE: {DATA_CACHE!r} (expected disk, memory or none)")
+
+    key = hashlib.sha1("\n".join([str(IMAGE_SIZE)] + paths).encode()).hexdigest()[:12]
+    prefix = DATA_CACHE_DIR / f"{name}-{key}"
+    DATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # A run killed mid-epoch leaves a lock file that would make TF refuse the cache
+    for stale in DATA_CACHE_DIR.glob(f"{prefix.name}*.lockfile"):
+        stale.unlink()
+    return ds.cache(str(prefix))
+
+
+def _make_dataset(paths: List[str], labels: List[int], name: str, training: bool = False) -> tf.data.Dataset:
+    """
+    files -> parallel decode (uint8) -> cache -> [shuffle] -> batch -> standardize -> prefetch.
+
+    Standardizing after the cache keeps cached images at 1 byte per channel
+    instead of 4. Training decodes with deterministic=False so a slow file
+    does not stall the batch behind it.
+    """
+    ds = tf.data.Dataset.from_tensor_slices((paths, labels))
+    ds = ds.map(_decode, num_parallel_calls=AUTOTUNE, deterministic=not training)
+    ds = _cache(ds, name, paths)
+    if training:
+        # Shuffle as much of the split as fits in SHUFFLE_BUFFER_BYTES of uint8 images;
+        # the file list was already shuffled once, so classes are mixed in the cache.
+        image_bytes = IMAGE_SIZE[0] * IMAGE_SIZE[1] * 3
+        buffer = max(BATCH_SIZE, min(len(paths), SHUFFLE_BUFFER_BYTES // image_bytes))
+        ds = ds.shuffle(buffer, seed=SEED, reshuffle_each_iteration=True)
+    ds = ds.batch(BATCH_SIZE)
+    ds = ds.map(lambda x, y: (_standardize(x), y), num_parallel_calls=AUTOTUNE)
+    return ds.prefetch(AUTOTUNE)
+
 # -----------------
 # Dataset Loader
 # -----------------
 def get_datasets() -> Tuple[
-    tf.data.Dataset, 
-    tf.data.Dataset, 
-    Optional[tf.data.Dataset], 
+    tf.data.Dataset,
+    tf.data.Dataset,
+    Optional[tf.data.Dataset],
     List[str]
 ]:
     """
     Load training, validation, and optional test datasets.
 
+    TRAIN_DIR is listed once and split into training/validation with SEED;
+    images are cached as uint8 (see DATA_CACHE) and standardized per batch.
+
     Returns:
         train_ds (tf.data.Dataset): Preprocessed training dataset
         val_ds   (tf.data.Dataset): Preprocessed validation dataset
         test_ds  (tf.data.Dataset | None): Preprocessed test dataset if available
         class_names (list[str]): List of class labels
     """
+    paths, labels, class_names = _list_files(TRAIN_DIR)
+    if not paths:
+        raise ValueError(f"No images found under {TRAIN_DIR}")
+    print(f"Found {len(paths)} files belonging to {len(class_names)} classes.")
+
+    # One seeded shuffle of the file list, then a split (train first, the tail is validation)
+    order = np.random.default_rng(SEED).permutation(len(paths))
+    paths = [paths[i] for i in order]
+    labels = [labels[i] for i in order]
+    num_val = int(VAL_SPLIT * len(paths))
+    split = len(paths) - num_val
 
-    train_ds = tf.keras.utils.image_dataset_from_directory(
-        TRAIN_DIR,
-        labels="inferred",
-        label_mode="int",
-        validation_split=VAL_SPLIT,
-        subset="training",
-        seed=SEED,
-        image_size=IMAGE_SIZE,
-        batch_size=BATCH_SIZE,
-    )
-    val_ds = tf.keras.utils.image_dataset_from_directory(
-        TRAIN_DIR,
-        labels="inferred",
-        label_mode="int",
-        validation_split=VAL_SPLIT,
-        subset="validation",
-        seed=SEED,
-        image_size=IMAGE_SIZE,
-        batch_size=BATCH_SIZE,
-    )
-
-    class_names = train_ds.class_names
+    train_ds = _make_dataset(paths[:split], labels[:split], "train", training=True)
+    val_ds   = _make_dataset(paths[split:], labels[split:], "val")
+    print(f"Using {split} files for training, {num_val} for validation.")
 
     test_ds = None
     if _has_class_subdirs(str(TEST_DIR)):
-        test_ds = tf.keras.utils.image_dataset_from_directory(
-            TEST_DIR,
-            labels="inferred",
-            label_mode="int",
-            image_size=IMAGE_SIZE,
-            batch_size=BATCH_SIZE,
-            shuffle=False,
-        )
-
-    # Preprocessing & caching
-    def _prepare(ds: tf.data.Dataset, training: bool = False) -> tf.data.Dataset:
-        ds = ds.map(lambda x, y: (_standardize(x), y), num_parallel_calls=AUTOTUNE)
-        if training:
-            ds = ds.shuffle(1000, seed=SEED)
-        return ds.cache().prefetch(AUTOTUNE)
-
-    train_ds = _prepare(train_ds, training=True)
-    val_ds   = _prepare(val_ds, training=False)
-    if test_ds is not None:
-        test_ds = _prepare(test_ds, training=False)
+        test_paths, test_labels, _ = _list_files(TEST_DIR, class_names)
+        if test_paths:
+            test_ds = _make_dataset(test_paths, test_labels, "test")
 
     return train_ds, val_ds, test_ds, class_names
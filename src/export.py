@@ -0,0 +1,156 @@
+import argparse
+import itertools
+import numpy as np
+
+from pathlib import Path
+from PIL import Image
+
+from .config import (
+    MODEL_PATH, CLASS_MAP_JSON, TFLITE_MODEL_PATH, ONNX_MODEL_PATH, TRAIN_DIR, TEST_DIR,
+    CALIBRATION_SAMPLES, ONNX_OPSET
+)
+from .infer import ASLClassifier
+from .preprocess import IMG_SIZE, preprocess
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+
+# -------------------------
+# Calibration Data
+# -------------------------
+def _representative_dataset(train_dir=TRAIN_DIR, per_class=CALIBRATION_SAMPLES):
+    """
+    Yield single preprocessed images from the first `per_class` files of every class
+    folder, interleaved across classes so a partial read is still balanced.
+    """
+    class_dirs = sorted(d for d in Path(train_dir).iterdir() if d.is_dir())
+    if not class_dirs:
+        raise FileNotFoundError(f"❌ No class folders found in {train_dir} for calibration.")
+
+    files = [
+        sorted(f for f in d.iterdir() if f.suffix.lower() in IMAGE_EXTS)[:per_class]
+        for d in class_dirs
+    ]
+    for group in itertools.zip_longest(*files):
+        for f in group:
+            if f is not None:
+                yield [preprocess(Image.open(f)).copy()]
+
+# -------------------------
+# TFLite Export
+# -------------------------
+def export_tflite(model_path=MODEL_PATH, out_path=TFLITE_MODEL_PATH, quantize="none"):
+    """
+    Convert the trained Keras model to TFLite.
+
+    quantize:
+        "none"    - float32 weights and activations
+        "dynamic" - int8 weights, float activations (no calibration data needed)
+        "int8"    - full-integer model calibrated on a slice of TRAIN_DIR
+    """
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(str(model_path))
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+    if quantize in ("dynamic", "int8"):
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == "int8":
+        converter.representative_dataset = _representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_bytes(converter.convert())
+    print(f"✅ Saved {quantize} TFLite model to {out_path} ({out_path.stat().st_size / 1e6:.1f} MB)")
+    return out_path
+
+# -------------------------
+# ONNX Export
+# -------------------------
+def export_onnx(model_path=MODEL_PATH, out_path=ONNX_MODEL_PATH, opset=ONNX_OPSET):
+    """
+    Convert the trained Keras model to ONNX with a dynamic batch dimension,
+    so it can be served by onnxruntime without importing TensorFlow.
+    """
+    import tensorflow as tf
+    try:
+        import tf2onnx
+    except ImportError as e:
+        raise ImportError("❌ ONNX export needs `pip install tf2onnx`.") from e
+
+    model = tf.keras.models.load_model(str(model_path))
+    spec = (tf.TensorSpec((None, *IMG_SIZE, 3), tf.float32, name="input"),)
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=opset, output_path=str(out_path))
+    print(f"✅ Saved ONNX model to {out_path} ({out_path.stat().st_size / 1e6:.1f} MB)")
+    return out_path
+
+# -------------------------
+# Parity Check
+# -------------------------
+def parity_check(candidate_path, reference_path=MODEL_PATH, test_dir=TEST_DIR, num_threads=None):
+    """
+    Compare an exported model against the float Keras model on the test set.
+    Test images are expected flat as `<label>_test*.jpg`, like data/asl_alphabet_test.
+    """
+    files = sorted(f for f in Path(test_dir).rglob("*") if f.suffix.lower() in IMAGE_EXTS)
+    if not files:
+        raise FileNotFoundError(f"❌ No test images found in {test_dir}")
+
+    reference = ASLClassifier(reference_path, CLASS_MAP_JSON)
+    candidate = ASLClassifier(candidate_path, CLASS_MAP_JSON, num_threads=num_threads)
+
+    images = [Image.open(f) for f in files]
+    ref_preds = [r["label"] for r in reference.predict_batch(images)]
+    cand_preds = [r["label"] for r in candidate.predict_batch(images)]
+    truth = [f.stem.split("_")[0] for f in files]
+
+    agreement = np.mean([r == c for r, c in zip(ref_preds, cand_preds)])
+    ref_acc = np.mean([r == t for r, t in zip(ref_preds, truth)])
+    cand_acc = np.mean([c == t for c, t in zip(cand_preds, truth)])
+
+    print(f"Images:            {len(files)}")
+    print(f"Top-1 agreement:   {agreement:.2%}")
+    print(f"Reference acc:     {ref_acc:.2%}")
+    print(f"Candidate acc:     {cand_acc:.2%}")
+    for f, r, c in zip(files, ref_preds, cand_preds):
+        if r != c:
+            print(f"  mismatch {f.name}: reference={r} candidate={c}")
+    return agreement
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the trained ASL model for faster CPU inference.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_tflite = sub.add_parser("tflite", help="Convert the Keras model to TFLite")
+    p_tflite.add_argument("--quantize", choices=["none", "dynamic", "int8"], default="none")
+    p_tflite.add_argument("--out", type=Path, default=TFLITE_MODEL_PATH)
+    p_tflite.add_argument("--no-check", action="store_true", help="Skip the parity check after export")
+
+    p_onnx = sub.add_parser("onnx", help="Convert the Keras model to ONNX")
+    p_onnx.add_argument("--out", type=Path, default=ONNX_MODEL_PATH)
+    p_onnx.add_argument("--opset", type=int, default=ONNX_OPSET)
+    p_onnx.add_argument("--no-check", action="store_true", help="Skip the parity check after export")
+
+    p_parity = sub.add_parser("parity", help="Report top-1 agreement with the float model")
+    p_parity.add_argument("model", type=Path, nargs="?", default=TFLITE_MODEL_PATH,
+                          help="Exported .tflite or .onnx model")
+
+    args = parser.parse_args()
+    if args.command == "tflite":
+        out = export_tflite(quantize=args.quantize, out_path=args.out)
+        if not args.no_check:
+            parity_check(out)
+    elif args.command == "onnx":
+        out = export_onnx(out_path=args.out, opset=args.opset)
+        if not args.no_check:
+            parity_check(out)
+    elif args.command == "parity":
+        parity_check(args.model)
+
+if __name__ == "__main__":
+    main()
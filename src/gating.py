@@ -0,0 +1,99 @@
+import time
+import numpy as np
+import cv2
+
+from .config import (
+    GATE_SIZE, GATE_MOTION_THRESHOLD, GATE_MIN_SKIN_FRACTION, GATE_REFRESH_SECONDS, GATE_SKIN_CHECK
+)
+
+# YCrCb skin range; loose on purpose, it only has to reject empty frames
+SKIN_LOWER = np.array([0, 133, 77], dtype=np.uint8)
+SKIN_UPPER = np.array([255, 173, 127], dtype=np.uint8)
+
+def skin_mask(img, rgb=False):
+    """Binary (0/255) mask of skin-coloured pixels in a BGR (or RGB) image."""
+    code = cv2.COLOR_RGB2YCrCb if rgb else cv2.COLOR_BGR2YCrCb
+    return cv2.inRange(cv2.cvtColor(img, code), SKIN_LOWER, SKIN_UPPER)
+
+# ----------------------------------------
+# Frame gate
+# ----------------------------------------
+class FrameGate:
+    """
+    Cheap pre-filter run before preprocessing/inference on live frames.
+
+    Works on a small downsampled copy of the frame:
+    - EMPTY:  too little skin/foreground area, so there is no hand to classify
+              (only with `skin_check`, off by default)
+    - STATIC: almost no change since the last frame sent to the model
+    - INFER:  anything else (and at least every `refresh_seconds`)
+    """
+    INFER, STATIC, EMPTY = "infer", "static", "empty"
+
+    def __init__(self, size=GATE_SIZE, motion_threshold=GATE_MOTION_THRESHOLD,
+                 min_skin_fraction=GATE_MIN_SKIN_FRACTION, refresh_seconds=GATE_REFRESH_SECONDS,
+                 skin_check=GATE_SKIN_CHECK):
+        self.size = size
+        self.skin_check = skin_check
+        self.motion_threshold = motion_threshold
+        self.min_skin_fraction = min_skin_fraction
+        self.refresh_seconds = refresh_seconds
+
+        self.inferred = 0
+        self.skipped_static = 0
+        self.skipped_empty = 0
+
+        self._reference = None          # gray thumbnail of the last inferred frame
+        self._reference_time = 0.0
+
+    def check(self, frame):
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+
+        if self.skin_check:
+            skin = cv2.countNonZero(skin_mask(small)) / float(small.shape[0] * small.shape[1])
+            if skin < self.min_skin_fraction:
+                self.skipped_empty += 1
+                self._reference = None
+                return self.EMPTY
+
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        now = time.time()
+        if self._reference is not None and now - self._reference_time < self.refresh_seconds:
+            motion = cv2.absdiff(gray, self._reference).mean() / 255.0
+            if motion < self.motion_threshold:
+                self.skipped_static += 1
+                return self.STATIC
+
+        self._reference = gray
+        self._reference_time = now
+        self.inferred += 1
+        return self.INFER
+
+    def stats(self):
+        return {
+            "inferred": self.inferred,
+            "skipped_static": self.skipped_static,
+            "skipped_empty": self.skipped_empty,
+        }
+
+def gate_frame(gate, decoder, frame, submit, nothing=None):
+    """
+    Route one sampled live frame. INFER: `submit(frame)` to the model. EMPTY:
+    feed the `nothing` vector to the decoder. STATIC: repeat the last vector,
+    so a held sign keeps counting towards the decoder's stable run without
+    another forward pass. Returns the gate decision.
+
+    The worker is asynchronous: while a submitted frame is still being
+    classified, STATIC frames are not repeated, so an older vector never gets
+    counted ahead of the result for the frame that changed.
+    """
+    decision = gate.check(frame) if gate else FrameGate.INFER
+    if decision == FrameGate.INFER:
+        decoder.expect()
+        submit(frame)
+    elif decision == FrameGate.EMPTY:
+        if nothing is not None:
+            decoder.update(nothing)
+    else:
+        decoder.repeat(payload=frame)
+    return decision
@@ -0,0 +1,86 @@
+import cv2
+import numpy as np
+
+from .config import HAND_DETECT_WIDTH, HAND_PADDING, HAND_REDETECT_EVERY, HAND_MIN_AREA, HAND_BOX_SMOOTHING
+from .gating import skin_mask
+
+_KERNEL = np.ones((3, 3), dtype=np.uint8)
+
+def detect_hand(img, rgb=False, detect_width=HAND_DETECT_WIDTH, min_area=HAND_MIN_AREA):
+    """
+    Locate the largest skin-coloured blob on a downsampled copy of `img`.
+    Returns (x, y, w, h) in full-resolution pixels, or None.
+    """
+    h, w = img.shape[:2]
+    scale = detect_width / float(w)
+    small = cv2.resize(img, (detect_width, max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+    mask = skin_mask(small, rgb=rgb)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, _KERNEL)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+
+    largest = max(contours, key=cv2.contourArea)
+    if cv2.contourArea(largest) < min_area * mask.shape[0] * mask.shape[1]:
+        return None
+    x, y, bw, bh = cv2.boundingRect(largest)
+    return np.array([x, y, bw, bh], dtype=np.float32) / scale
+
+def crop_box(img, box, padding=HAND_PADDING):
+    """Crop a padded square around `box`, clamped to the image."""
+    h, w = img.shape[:2]
+    x, y, bw, bh = box
+    side = max(bw, bh) * (1.0 + 2.0 * padding)
+    cx, cy = x + bw / 2.0, y + bh / 2.0
+    x0, y0 = int(max(0, cx - side / 2)), int(max(0, cy - side / 2))
+    x1, y1 = int(min(w, cx + side / 2)), int(min(h, cy + side / 2))
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return img
+    return img[y0:y1, x0:x1]
+
+def crop_hand(img, rgb=False):
+    """One-shot crop for single images (uploads); returns `img` if no hand is found."""
+    box = detect_hand(img, rgb=rgb)
+    return img if box is None else crop_box(img, box)
+
+# ----------------------------------------
+# Tracked crop for video streams
+# ----------------------------------------
+class HandTracker:
+    """
+    Keeps a hand bounding box across frames of a stream. The (cheap) skin-blob
+    detection only runs every `redetect_every` frames or when there is no box;
+    in between the previous box is reused, and new detections are blended into
+    it to keep the crop steady.
+    """
+    def __init__(self, redetect_every=HAND_REDETECT_EVERY, smoothing=HAND_BOX_SMOOTHING, rgb=False):
+        self.redetect_every = redetect_every
+        self.smoothing = smoothing
+        self.rgb = rgb
+        self.box = None
+        self._since_detect = 0
+
+    def update(self, frame):
+        if self.box is None or self._since_detect >= self.redetect_every:
+            found = detect_hand(frame, rgb=self.rgb)
+            self._since_detect = 0
+            if found is None:
+                self.box = None
+            elif self.box is None:
+                self.box = found
+            else:
+                self.box = self.smoothing * self.box + (1.0 - self.smoothing) * found
+        else:
+            self._since_detect += 1
+        return self.box
+
+    def crop(self, frame, rgb=None):
+        if rgb is not None:
+            self.rgb = rgb
+        box = self.update(frame)
+        return frame if box is None else crop_box(frame, box)
+
+    def reset(self):
+        self.box = None
+        self._since_detect = 0
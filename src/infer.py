@@ -1,53 +1,141 @@
-from PIL import Image
+from pathlib import Path
+from collections.abc import Mapping
 
 import numpy as np
-import cv2
-import tensorflow as tf
 import json
 
-IMG_SIZE = (160, 160) 
+from .backends import KerasBackend, TFLiteBackend, ONNXBackend
+from .preprocess import IMG_SIZE, preprocess, preprocess_batch
+
+BACKENDS = {
+    ".h5": "keras",
+    ".keras": "keras",
+    ".tflite": "tflite",
+    ".onnx": "onnx",
+}
+
+# -------------------------
+# Prediction Result
+# -------------------------
+class Prediction(Mapping):
+    """
+    Result of one prediction. Keeps the raw probability vector and only builds
+    Python objects on demand: `top_k` uses argpartition instead of sorting all
+    classes, and the full `probs` dict is created only when accessed.
+
+    Supports the old dict-style access (`result["label"]`, `result["probs"]`, ...).
+    """
+    __slots__ = ("vector", "class_names", "index")
+    _KEYS = ("label", "index", "confidence", "probs")
+
+    def __init__(self, vector, class_names):
+        self.vector = vector
+        self.class_names = class_names
+        self.index = int(np.argmax(vector))
+
+    @property
+    def label(self):
+        return self.class_names[self.index]
+
+    @property
+    def confidence(self):
+        return float(self.vector[self.index])
+
+    @property
+    def probs(self):
+        return {name: float(p) for name, p in zip(self.class_names, self.vector.tolist())}
+
+    def top_k(self, k=5):
+        """[(label, confidence)] for the k most likely classes, highest first."""
+        k = min(k, len(self.vector))
+        idx = np.argpartition(self.vector, -k)[-k:]
+        idx = idx[np.argsort(self.vector[idx])[::-1]]
+        return [(self.class_names[i], float(self.vector[i])) for i in idx]
+
+    def top_k_dicts(self, k=5):
+        """Same as `top_k`, in the {"label", "confidence"} form stored in history."""
+        return [{"label": label, "confidence": conf} for label, conf in self.top_k(k)]
+
+    def to_dict(self):
+        return {key: self[key] for key in self._KEYS}
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"Prediction(label={self.label!r}, confidence={self.confidence:.4f})"
 
 class ASLClassifier:
-    def __init__(self, model_path, class_map_path):
-        self.model = tf.keras.models.load_model(str(model_path))
+    def __init__(self, model_path, class_map_path, backend=None, num_threads=None):
+        """
+        backend: "keras", "tflite" or "onnx"; inferred from the model file extension if None.
+        num_threads: TFLite interpreter / ONNX intra-op threads (None = value from config).
+        """
+        backend = backend or BACKENDS.get(Path(model_path).suffix.lower(), "keras")
+        if backend == "keras":
+            self.backend = KerasBackend(model_path, (*IMG_SIZE, 3))
+        elif backend == "tflite":
+            self.backend = TFLiteBackend(model_path, num_threads=num_threads)
+        elif backend == "onnx":
+            self.backend = ONNXBackend(model_path, intra_op_threads=num_threads)
+        else:
+            raise ValueError(f"Unknown inference backend: {backend}")
+
         with open(class_map_path, 'r') as f:
             self.class_names = json.load(f)
 
+        self.predict_probs(np.zeros((1, *IMG_SIZE, 3), dtype=np.float32))  # warm-up
+
     @staticmethod
     def _preprocess(img):
         """
         Preprocess input image (PIL.Image, np.ndarray, or uploaded file) for model prediction.
         Ensures output is always (1, 160, 160, 3)
         """
-        # If it's a PIL image
-        if isinstance(img, Image.Image):
-            img_array = np.array(img.convert("RGB"))
-        # If it's a NumPy array (OpenCV BGR image)
-        elif isinstance(img, np.ndarray):
-            if img.ndim == 2:
-                img_array = cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
-            elif img.shape[2] == 3:
-                img_array = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            else:
-                raise ValueError(f"Unexpected number of channels: {img.shape[2]}")
-        else:
-            img_array = np.array(img)
-            if img_array.ndim == 2:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_GRAY2RGB)
-            elif img_array.ndim == 3 and img_array.shape[2] == 4:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+        return preprocess(img)
+
+    @staticmethod
+    def _preprocess_batch(images):
+        """
+        Preprocess a list of images into one contiguous (N, 160, 160, 3) float32 tensor.
+        """
+        return preprocess_batch(images)
 
-        img_resized = cv2.resize(img_array, (160, 160), interpolation=cv2.INTER_AREA)
-        img_normalized = img_resized.astype(np.float32) / 255.0
-        return np.expand_dims(img_normalized, axis=0)
+    def result(self, probs):
+        """Prediction for one (num_classes,) probability vector, e.g. from `predict_probs`."""
+        return Prediction(probs, self.class_names)
+
+    def predict_probs(self, x):
+        """
+        Run the backend on a preprocessed (N, 160, 160, 3) float32 batch.
+        Returns the (N, num_classes) probability array.
+        """
+        return self.backend(np.ascontiguousarray(x, dtype=np.float32))
 
     def predict(self, img):
         x = self._preprocess(img)
-        probs = self.model.predict(x, verbose=0)[0]
-        idx = int(np.argmax(probs))
-        return {
-            "label": self.class_names[idx],
-            "index": idx,
-            "confidence": float(probs[idx]),
-            "probs": {self.class_names[i]: float(p) for i, p in enumerate(probs)}
-        }
+        probs = self.predict_probs(x)[0]
+        return self.result(probs)
+
+    def predict_batch(self, images, batch_size=32):
+        """
+        Predict a list of images with a single forward pass per `batch_size` chunk.
+        Returns one Prediction per image, like `predict`.
+        """
+        images = list(images)
+        if not images:
+            return []
+
+        x = self._preprocess_batch(images)
+        probs = np.concatenate([
+            self.predict_probs(x[i:i + batch_size]) for i in range(0, len(x), batch_size)
+        ])
+        return [self.result(p) for p in probs]
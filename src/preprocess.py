@@ -0,0 +1,161 @@
+import threading
+import numpy as np
+import cv2
+
+from pathlib import Path
+from PIL import Image
+
+from .config import IMAGE_SIZE, HAND_CROP
+
+# ------------------------------------------------------------
+# One preprocessing pipeline for training, evaluation, upload
+# and live inference. Models see RGB, IMAGE_SIZE, area
+# interpolation, normalized to [-1, 1] (MobileNetV2 range).
+# ------------------------------------------------------------
+IMG_SIZE = tuple(IMAGE_SIZE)            # (height, width)
+INTERPOLATION = cv2.INTER_AREA          # matches interpolation="area" in src/data.py
+
+def standardize_tf(x):
+    """
+    Normalize images to [-1, 1] range for MobileNetV2 (TensorFlow version,
+    used inside tf.data). Same float32 op order as `standardize_`.
+    """
+    import tensorflow as tf
+    x = tf.cast(x, tf.float32) / 255.0
+    return (x - 0.5) * 2.0
+
+def standardize_(x):
+    """In-place NumPy version of `standardize_tf` on a float32 array."""
+    x /= np.float32(255.0)
+    x -= np.float32(0.5)
+    x *= np.float32(2.0)
+    return x
+
+def _as_array(img):
+    """
+    Return (array, cv2 code converting it to RGB or None).
+    np.ndarray inputs are OpenCV images (BGR / gray / BGRA); PIL images and
+    uploaded files are decoded as RGB.
+    """
+    if isinstance(img, np.ndarray):
+        if img.ndim == 2:
+            return img, cv2.COLOR_GRAY2RGB
+        if img.shape[2] == 3:
+            return img, cv2.COLOR_BGR2RGB
+        if img.shape[2] == 4:
+            return img, cv2.COLOR_BGRA2RGB
+        raise ValueError(f"Unexpected number of channels: {img.shape[2]}")
+    if not isinstance(img, Image.Image):
+        img = Image.open(img)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    return np.asarray(img), None
+
+class Preprocessor:
+    """
+    Preprocess images into a reusable, preallocated float32 batch buffer.
+
+    Each image is resized first (so colour conversion runs on IMG_SIZE pixels,
+    not the full frame), converted to RGB into a scratch buffer, copied into its
+    batch slot and normalized in place. The returned array is a view into the
+    buffer and is overwritten by the next call, so use one Preprocessor per thread.
+
+    crop: optional callable(array, rgb) -> array applied before resizing
+          (e.g. hand cropping).
+    """
+    def __init__(self, batch_size=1, crop=None):
+        self.crop = crop
+        self._batch = np.empty((batch_size, *IMG_SIZE, 3), dtype=np.float32)
+        self._resized = {}                              # channels -> uint8 scratch
+        self._rgb = np.empty((*IMG_SIZE, 3), dtype=np.uint8)
+
+    def _scratch(self, channels):
+        if channels not in self._resized:
+            shape = IMG_SIZE if channels == 1 else (*IMG_SIZE, channels)
+            self._resized[channels] = np.empty(shape, dtype=np.uint8)
+        return self._resized[channels]
+
+    def _into(self, img, out):
+        arr, code = _as_array(img)
+        if self.crop is not None and arr.ndim == 3 and arr.shape[2] == 3:
+            arr = self.crop(arr, code is None)
+        if arr.dtype != np.uint8:
+            arr = np.clip(arr, 0, 255).astype(np.uint8)
+
+        channels = 1 if arr.ndim == 2 else arr.shape[2]
+        resized = cv2.resize(arr, IMG_SIZE[::-1], dst=self._scratch(channels), interpolation=INTERPOLATION)
+        if code is not None:
+            resized = cv2.cvtColor(resized, code, dst=self._rgb)
+        np.copyto(out, resized, casting="unsafe")
+        standardize_(out)
+        return out
+
+    def __call__(self, images):
+        """(N, H, W, 3) float32 view for a list of images."""
+        n = len(images)
+        if n > len(self._batch):
+            self._batch = np.empty((n, *IMG_SIZE, 3), dtype=np.float32)
+        batch = self._batch[:n]
+        for i, img in enumerate(images):
+            self._into(img, batch[i])
+        return batch
+
+    def one(self, img):
+        """(1, H, W, 3) float32 view for a single image."""
+        return self([img])
+
+# ----------------------------
+# Thread-local default pipeline
+# ----------------------------
+_LOCAL = threading.local()
+
+def _default():
+    pre = getattr(_LOCAL, "pre", None)
+    if pre is None:
+        crop = None
+        if HAND_CROP:
+            from .hand_crop import crop_hand
+            crop = lambda arr, rgb: crop_hand(arr, rgb=rgb)
+        pre = _LOCAL.pre = Preprocessor(crop=crop)
+    return pre
+
+def preprocess(img):
+    """Preprocess one image to (1, H, W, 3); valid until the next call on this thread."""
+    return _default().one(img)
+
+def preprocess_batch(images):
+    """Preprocess images to (N, H, W, 3); valid until the next call on this thread."""
+    return _default()(images)
+
+# ----------------------------
+# Train / serve parity check
+# ----------------------------
+def check_parity(image_paths, atol=4.0 / 255.0):
+    """
+    Compare the serving pipeline with the training pipeline (tf.image area
+    resize + `standardize_tf`) on the same files. Normalization must agree
+    exactly; resize implementations may differ by about one grey level.
+    Returns the max absolute difference.
+    """
+    import tensorflow as tf
+
+    worst = 0.0
+    for path in image_paths:
+        raw = tf.io.decode_image(tf.io.read_file(str(path)), channels=3, expand_animations=False)
+        train = standardize_tf(tf.image.resize(raw, IMG_SIZE, method="area")).numpy()
+        serve = Preprocessor().one(Image.open(path))[0]
+        worst = max(worst, float(np.abs(train - serve).max()))
+
+        # Identical input must give bit-identical normalization
+        resized = np.asarray(tf.cast(tf.image.resize(raw, IMG_SIZE, method="area"), tf.uint8))
+        norm_np = standardize_(resized.astype(np.float32))
+        norm_tf = standardize_tf(resized).numpy()
+        assert np.array_equal(norm_np, norm_tf), f"normalization mismatch on {path}"
+
+    assert worst <= atol, f"train/serve preprocessing differ by {worst:.4f} (> {atol:.4f})"
+    return worst
+
+if __name__ == "__main__":
+    from .config import TEST_DIR
+    files = sorted(p for p in Path(TEST_DIR).rglob("*") if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+    print(f"✅ Train/serve parity on {len(files)} images, max abs diff: {check_parity(files):.5f}")
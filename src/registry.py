@@ -0,0 +1,135 @@
+import os
+import time
+import hashlib
+import threading
+
+from pathlib import Path
+
+from .config import INFERENCE_MODEL_PATH, INFERENCE_BACKEND, CLASS_MAP_JSON
+
+# ---------------------------
+# Memory Accounting
+# ---------------------------
+def current_rss():
+    """Resident set size of this process in bytes, or None if it can't be read."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# ---------------------------
+# Model Registry
+# ---------------------------
+class ModelRegistry:
+    """
+    Process-wide cache of loaded classifiers shared by every page and session.
+
+    A model is loaded once per (path, backend). Each `get` does a cheap stat of
+    the model file; if its mtime/size changed, the content hash decides whether
+    it is really a new model and needs a reload.
+
+    Hooks registered with `add_hook` receive a dict per load/reload with the
+    model version, load time and RSS before/after, for memory accounting.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._hooks = []
+
+    def add_hook(self, fn):
+        self._hooks.append(fn)
+        return fn
+
+    def _emit(self, event):
+        for fn in self._hooks:
+            try:
+                fn(event)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _stat(path):
+        st = Path(path).stat()
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self, key, model_path, class_map_path, backend, reason):
+        from .infer import ASLClassifier
+
+        rss_before = current_rss()
+        start = time.perf_counter()
+        clf = ASLClassifier(model_path, class_map_path, backend=backend)
+        clf.version = file_hash(model_path)[:12]
+        entry = {
+            "clf": clf,
+            "stat": self._stat(model_path),
+            "version": clf.version,
+            "loaded_at": time.time(),
+            "load_seconds": time.perf_counter() - start,
+            "rss_before": rss_before,
+            "rss_after": current_rss(),
+        }
+        self._entries[key] = entry
+        self._emit({"event": reason, "model_path": str(model_path), "backend": backend,
+                    **{k: v for k, v in entry.items() if k != "clf"}})
+        return clf
+
+    def get(self, model_path=INFERENCE_MODEL_PATH, class_map_path=CLASS_MAP_JSON, backend=INFERENCE_BACKEND):
+        """
+        Return the shared classifier, loading or reloading it if the file changed.
+        Once a model is loaded it keeps being served if the file disappears or a
+        reload fails; the next change on disk is tried again.
+        """
+        key = (str(Path(model_path).resolve()), backend)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._load(key, model_path, class_map_path, backend, "load")
+
+            try:
+                stat = self._stat(model_path)
+            except OSError:
+                return entry["clf"]  # file removed: keep serving the loaded model
+            if stat == entry["stat"]:
+                return entry["clf"]
+            try:
+                if file_hash(model_path)[:12] == entry["version"]:
+                    entry["stat"] = stat  # touched, same content
+                    return entry["clf"]
+                return self._load(key, model_path, class_map_path, backend, "reload")
+            except Exception:
+                entry["stat"] = stat  # unloadable: keep the old model until the file changes again
+                return entry["clf"]
+
+    def reload(self, model_path=INFERENCE_MODEL_PATH, class_map_path=CLASS_MAP_JSON, backend=INFERENCE_BACKEND):
+        """Force a reload of the model from disk. The current model stays in place if it fails."""
+        key = (str(Path(model_path).resolve()), backend)
+        with self._lock:
+            return self._load(key, model_path, class_map_path, backend, "reload")
+
+    def stats(self):
+        """Per-model version, load time and RSS delta."""
+        with self._lock:
+            return [
+                {"model_path": key[0], "backend": key[1],
+                 **{k: v for k, v in entry.items() if k not in ("clf", "stat")}}
+                for key, entry in self._entries.items()
+            ]
+
+REGISTRY = ModelRegistry()
+
+def get_classifier():
+    """The classifier configured in src/config.py, shared across the process."""
+    return REGISTRY.get()
@@ -0,0 +1,129 @@
+import threading
+import numpy as np
+
+from collections import deque
+
+from .config import (
+    SMOOTHING_ALPHA, STABLE_FRAMES, STABLE_MIN_CONFIDENCE, DRIFT_THRESHOLD,
+    STREAM_SAMPLE_INTERVAL, STABLE_SAMPLE_INTERVAL
+)
+
+# ------------------------------------------------
+# Streaming decoder for live letter predictions
+# ------------------------------------------------
+class StreamDecoder:
+    """
+    Smooths per-frame probability vectors and detects stable letters.
+
+    Keeps a ring buffer of the last `stable_frames` vectors and an exponential
+    moving average (EMA) over all of them. A letter becomes stable once the EMA
+    argmax has been the same for `stable_frames` updates in a row with at least
+    `min_confidence`. While a letter is stable the stream is sampled every
+    `slow_interval` seconds instead of `fast_interval`; once the raw probabilities
+    drift away from the stable EMA (total variation > `drift_threshold`) the
+    letter is released and fast sampling resumes.
+    """
+    def __init__(self, class_names, alpha=SMOOTHING_ALPHA, stable_frames=STABLE_FRAMES,
+                 min_confidence=STABLE_MIN_CONFIDENCE, drift_threshold=DRIFT_THRESHOLD,
+                 fast_interval=STREAM_SAMPLE_INTERVAL, slow_interval=STABLE_SAMPLE_INTERVAL):
+        self.class_names = class_names
+        self.alpha = alpha
+        self.stable_frames = stable_frames
+        self.min_confidence = min_confidence
+        self.drift_threshold = drift_threshold
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+
+        self.ring = deque(maxlen=stable_frames)     # recent raw probability vectors
+        self.ema = None
+        self.stable_index = None
+        self._stable_ema = None
+        self._emitted = deque(maxlen=8)
+        self._expecting = False                     # a submitted frame has no result yet
+        self._lock = threading.Lock()
+
+    @property
+    def label(self):
+        """Current smoothed label (EMA argmax), or None before the first update."""
+        if self.ema is None:
+            return None
+        return self.class_names[int(np.argmax(self.ema))]
+
+    @property
+    def confidence(self):
+        return 0.0 if self.ema is None else float(np.max(self.ema))
+
+    @property
+    def stable_label(self):
+        return None if self.stable_index is None else self.class_names[self.stable_index]
+
+    @property
+    def sample_interval(self):
+        """Seconds to wait between sampled frames; longer while a letter is held."""
+        return self.fast_interval if self.stable_index is None else self.slow_interval
+
+    def update(self, probs, payload=None):
+        """
+        Feed one probability vector. Returns the label if it just became stable,
+        else None. `payload` (e.g. the frame) and the smoothed probabilities are
+        kept with the emitted letter.
+        """
+        probs = np.asarray(probs, dtype=np.float32)
+        with self._lock:
+            self._expecting = False
+            self.ring.append(probs)
+            if self.ema is None:
+                self.ema = probs.copy()
+            else:
+                self.ema *= 1.0 - self.alpha
+                self.ema += self.alpha * probs
+
+            if self.stable_index is not None:
+                drift = 0.5 * float(np.abs(probs - self._stable_ema).sum())
+                if drift > self.drift_threshold:
+                    self.stable_index = None
+                    self._stable_ema = None
+                return None
+
+            idx = int(np.argmax(self.ema))
+            if len(self.ring) < self.stable_frames or self.ema[idx] < self.min_confidence:
+                return None
+            if any(int(np.argmax(p)) != idx for p in self.ring):
+                return None
+
+            self.stable_index = idx
+            self._stable_ema = self.ema.copy()
+            label = self.class_names[idx]
+            self._emitted.append((label, payload, self._stable_ema))
+            return label
+
+    def expect(self):
+        """Note that a frame was sent to the model; `repeat` waits for its vector."""
+        with self._lock:
+            self._expecting = True
+
+    def repeat(self, payload=None):
+        """
+        Feed the last vector again, for a frame known to look like the previous
+        one (see FrameGate.STATIC). Returns like `update`; None before any update
+        or while an `expect`ed vector is still outstanding.
+        """
+        with self._lock:
+            if not self.ring or self._expecting:
+                return None
+            probs = self.ring[-1]
+        return self.update(probs, payload=payload)
+
+    def pop_stable(self):
+        """Oldest stable letter not yet consumed, as (label, payload, probs), or None."""
+        with self._lock:
+            return self._emitted.popleft() if self._emitted else None
+
+    def reset(self):
+        with self._lock:
+            self.ring.clear()
+            self.ema = None
+            self.stable_index = None
+            self._stable_ema = None
+            self._emitted.clear()
+            self._expecting = False
@@ -0,0 +1,182 @@
+import math
+import heapq
+import string
+import numpy as np
+
+from collections import Counter, namedtuple
+
+from .config import SPELL_BEAM_WIDTH, SPELL_TOP_N, SPELL_LM_WEIGHT, SPELL_OOV_PENALTY, SPELL_MIN_MARGIN
+
+Candidate = namedtuple("Candidate", ["word", "score", "in_lexicon", "signed"])
+
+_START, _END = "^", "$"
+_EPS = 1e-9
+ALPHABET = string.ascii_lowercase
+
+# ------------------------------------------------
+# Prefix trie over the lexicon
+# ------------------------------------------------
+class Trie:
+    """
+    Array-backed prefix trie. Node i has `children[i]` (char -> node),
+    `terminal[i]` (a word ends here) and `lengths[i]`, a bitmask with bit k set
+    when some word ends k characters below the node. The mask lets the decoder
+    drop prefixes that cannot finish at the required word length.
+    """
+    def __init__(self, words=()):
+        self.children = [{}]
+        self.terminal = [False]
+        self.lengths = [0]
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        node, n = 0, len(word)
+        self.lengths[0] |= 1 << n
+        for depth, ch in enumerate(word, start=1):
+            nxt = self.children[node].get(ch)
+            if nxt is None:
+                nxt = len(self.children)
+                self.children[node][ch] = nxt
+                self.children.append({})
+                self.terminal.append(False)
+                self.lengths.append(0)
+            node = nxt
+            self.lengths[node] |= 1 << (n - depth)
+        if not self.terminal[node]:
+            self.terminal[node] = True
+            self.size += 1
+
+    def find(self, word):
+        node = 0
+        for ch in word:
+            node = self.children[node].get(ch)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, word):
+        node = self.find(word)
+        return node is not None and self.terminal[node]
+
+    def __len__(self):
+        return self.size
+
+# ------------------------------------------------
+# Letter bigram prior
+# ------------------------------------------------
+class LetterBigram:
+    """
+    log P(next letter | previous letter) estimated from the lexicon with add-k
+    smoothing; `^` and `$` mark the start and end of a word.
+    """
+    def __init__(self, words, alphabet, k=0.5):
+        counts = Counter()
+        for word in words:
+            padded = _START + word + _END
+            counts.update(zip(padded, padded[1:]))
+
+        targets = list(alphabet) + [_END]
+        self.logp = {}
+        for prev in [_START] + list(alphabet):
+            total = sum(counts[(prev, t)] for t in targets) + k * len(targets)
+            self.logp[prev] = {t: math.log((counts[(prev, t)] + k) / total) for t in targets}
+
+    def __call__(self, prev, nxt):
+        return self.logp[prev][nxt]
+
+# ------------------------------------------------
+# Beam search speller
+# ------------------------------------------------
+class Speller:
+    """
+    Turns one probability vector per captured letter into ranked words.
+
+    Beam search walks the lexicon trie one position at a time, scoring each
+    prefix by the classifier log-probability of its letters plus
+    `lm_weight` x the letter bigram prior, keeping the best `beam_width`
+    prefixes that can still end at the right length.
+
+    The word as signed (per-letter argmax) is always among the candidates. Out
+    of the lexicon it pays `oov_penalty` scaled by the uncertainty of its least
+    confident letter, so clearly signed names and rare words are not rewritten,
+    and it stays the first candidate unless a lexicon word beats it by
+    `min_margin` (log-score).
+    """
+    def __init__(self, words, beam_width=SPELL_BEAM_WIDTH, lm_weight=SPELL_LM_WEIGHT,
+                 oov_penalty=SPELL_OOV_PENALTY, min_margin=SPELL_MIN_MARGIN):
+        words = sorted({w.strip().lower() for w in words if w and w.strip()})
+        words = [w for w in words if all(ch in ALPHABET for ch in w)]
+        self.alphabet = ALPHABET
+        self.trie = Trie(words)
+        self.prior = LetterBigram(words, self.alphabet)
+        self.beam_width = beam_width
+        self.lm_weight = lm_weight
+        self.oov_penalty = oov_penalty
+        self.min_margin = min_margin
+
+    def _letter_logprobs(self, prob_vectors, class_names):
+        """(L, len(alphabet)) log-probs, renormalized over the letter classes."""
+        lookup = {name.lower(): i for i, name in enumerate(class_names) if len(name) == 1}
+        cols = [lookup.get(ch) for ch in self.alphabet]
+        probs = np.asarray(prob_vectors, dtype=np.float64)
+        letters = np.stack([probs[:, c] if c is not None else np.zeros(len(probs)) for c in cols], axis=1)
+        letters /= np.maximum(letters.sum(axis=1, keepdims=True), _EPS)
+        return np.log(letters + _EPS)
+
+    def _score(self, word, logp, col):
+        lm = sum(self.prior(a, b) for a, b in zip(_START + word, word + _END)) if word else 0.0
+        return float(sum(logp[t, col[ch]] for t, ch in enumerate(word))) + self.lm_weight * lm
+
+    def decode(self, prob_vectors, class_names, top_n=SPELL_TOP_N):
+        """
+        Up to `top_n` Candidates for a word of len(prob_vectors) letters, suggested
+        word first: the signed word unless a lexicon word wins by `min_margin`,
+        then the rest by score. The signed word is always included.
+        """
+        n = len(prob_vectors)
+        if n == 0:
+            return []
+        logp = self._letter_logprobs(prob_vectors, class_names)
+        col = {ch: i for i, ch in enumerate(self.alphabet)}
+        steps = [dict(zip(self.alphabet, row)) for row in logp.tolist()]    # plain floats: faster in the loop
+        children, lengths, w = self.trie.children, self.trie.lengths, self.lm_weight
+
+        beams = [(0.0, 0, "")]
+        for t in range(n):
+            remaining = n - t - 1
+            step = steps[t]
+            expanded = []
+            for score, node, prefix in beams:
+                prev = prefix[-1] if prefix else _START
+                bigram = self.prior.logp[prev]
+                for ch, child in children[node].items():
+                    if not (lengths[child] >> remaining) & 1:
+                        continue
+                    expanded.append((score + step[ch] + w * bigram[ch], child, prefix + ch))
+            beams = heapq.nlargest(self.beam_width, expanded)
+
+        raw = "".join(self.alphabet[i] for i in logp.argmax(axis=1))
+        results = [
+            Candidate(prefix, float(score + w * self.prior(prefix[-1], _END)), True, prefix == raw)
+            for score, node, prefix in beams if self.trie.terminal[node]
+        ]
+
+        signed = next((c for c in results if c.signed), None)
+        if signed is None:
+            in_lexicon = raw in self.trie
+            score = self._score(raw, logp, col)
+            if not in_lexicon:
+                # Letters signed at 0.95 barely pay the penalty; an unsure letter pays most of it
+                certainty = float(np.exp(logp.max(axis=1)).min())
+                score += self.oov_penalty * (1.0 - certainty)
+            signed = Candidate(raw, score, in_lexicon, True)
+            results.append(signed)
+
+        others = sorted((c for c in results if not c.signed), key=lambda c: c.score, reverse=True)
+        if others and others[0].score - signed.score >= self.min_margin:
+            ranked = [others[0], signed] + others[1:]
+        else:
+            ranked = [signed] + others
+        return ranked[:max(top_n, ranked.index(signed) + 1)]
@@ -0,0 +1,96 @@
+import time
+import threading
+
+from collections import deque
+from concurrent.futures import CancelledError
+
+# ----------------------------------------
+# Latest-frame inference worker
+# ----------------------------------------
+class InferenceWorker:
+    """
+    Background thread that classifies the most recent frame handed to it.
+
+    `submit` never blocks: it overwrites a single-slot buffer, so a frame that
+    arrives while the model is busy replaces the one still waiting (counted as
+    dropped). The video callback can then return immediately with `latest`.
+
+    If a `scheduler` is given, frames are sent through the shared BatchScheduler
+    instead of calling the model directly. `on_result(frame, probs)` is called on
+    the worker thread after every prediction.
+    """
+    def __init__(self, clf, preprocess, scheduler=None, on_result=None, name="asl-inference"):
+        self.clf = clf
+        self.preprocess = preprocess
+        self.scheduler = scheduler
+        self.on_result = on_result
+        self.latest = None              # last result dict, or None
+        self.error = None               # last exception message, or None
+
+        self.submitted = 0
+        self.dropped = 0
+        self.inferred = 0
+
+        self._slot = None
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._done_times = deque(maxlen=30)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame):
+        """Hand off the newest frame; replaces any frame still waiting."""
+        with self._cond:
+            if self._slot is not None:
+                self.dropped += 1
+            self._slot = frame
+            self.submitted += 1
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._slot is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                frame, self._slot = self._slot, None
+
+            try:
+                x = self.preprocess(frame)
+                if self.scheduler is not None:
+                    probs = self.scheduler.submit(id(self), x[0]).result()
+                else:
+                    probs = self.clf.predict_probs(x)[0]
+                self.latest = self.clf.result(probs)
+                self.error = None
+                if self.on_result is not None:
+                    self.on_result(frame, probs)
+            except CancelledError:
+                self.dropped += 1
+                continue
+            except Exception as e:
+                self.error = str(e)
+            self.inferred += 1
+            self._done_times.append(time.perf_counter())
+
+    @property
+    def fps(self):
+        """Inference rate over the last few predictions."""
+        times = self._done_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def stats(self):
+        return {
+            "fps": self.fps,
+            "submitted": self.submitted,
+            "inferred": self.inferred,
+            "dropped": self.dropped,
+        }
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
@@ -0,0 +1,64 @@
+import json
+import numpy as np
+import pytest
+
+from PIL import Image
+
+from src import batch_predict
+from src.batch_predict import CSVWriter, JSONLWriter, run
+from src.infer import ASLClassifier
+
+CLASSES = ["A", "B", "C"]
+
+def _classifier(*_):
+    """ASLClassifier with a stub backend that always says "B"."""
+    clf = ASLClassifier.__new__(ASLClassifier)
+    clf.class_names = CLASSES
+    clf.backend = lambda x: np.tile(np.float32([0.2, 0.7, 0.1]), (len(x), 1))
+    return clf
+
+@pytest.fixture
+def images(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_predict, "_classifier", _classifier)
+    folder = tmp_path / "images"
+    folder.mkdir()
+    for i in range(5):
+        Image.new("RGB", (32, 32), (i * 40, 0, 0)).save(folder / f"{i}.png")
+    return sorted(str(p) for p in folder.iterdir())
+
+@pytest.mark.parametrize("suffix, cls", [(".csv", CSVWriter), (".jsonl", JSONLWriter)])
+def test_resume_skips_scored_files_and_drops_a_half_written_line(tmp_path, images, suffix, cls):
+    out = tmp_path / f"predictions{suffix}"
+    run([str(tmp_path / "images")], out, batch_size=2, threads=1)
+    rows = list(cls.read(out))
+    assert [r["path"] for r in rows] == images
+    assert all(r["label"] == "B" and r["top_k"][0] == ["B", pytest.approx(0.7)] for r in rows)
+
+    # Interrupted run: the last two rows never made it, the one before is cut in half
+    lines = out.read_bytes().splitlines(keepends=True)
+    out.write_bytes(b"".join(lines[:-2])[:-10])
+
+    assert run([str(tmp_path / "images")], out, batch_size=2, threads=1, resume=True) == 3
+    rows = list(cls.read(out))
+    assert sorted(r["path"] for r in rows) == images
+    assert len(rows) == len(images)
+
+def test_resume_folds_in_part_files_from_an_interrupted_parallel_run(tmp_path, images):
+    out = tmp_path / "predictions.jsonl"
+    part = tmp_path / "predictions.part1.jsonl"
+    part.write_text(json.dumps({"path": images[0], "label": "A", "confidence": 0.9,
+                                "top_k": [["A", 0.9]], "error": None}) + "\n")
+
+    assert run([str(tmp_path / "images")], out, threads=1, resume=True) == 4
+    rows = {r["path"]: r for r in JSONLWriter.read(out)}
+    assert sorted(rows) == images
+    assert rows[images[0]]["label"] == "A"             # kept from the part file, not re-scored
+    assert not part.exists()
+
+def test_unreadable_image_gets_an_error_row(tmp_path, images):
+    (tmp_path / "images" / "broken.png").write_bytes(b"not an image")
+    out = tmp_path / "predictions.jsonl"
+    run([str(tmp_path / "images")], out, threads=1)
+    rows = {r["path"]: r for r in JSONLWriter.read(out)}
+    broken = rows[str(tmp_path / "images" / "broken.png")]
+    assert broken["label"] is None and broken["error"]
@@ -0,0 +1,67 @@
+import time
+import threading
+import numpy as np
+import pytest
+
+from concurrent.futures import CancelledError
+
+from src.batching import BatchScheduler
+
+class GatedClassifier:
+    """Echoes each frame back as its 'probabilities'; the first batch waits for `release`."""
+    def __init__(self):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def predict_probs(self, x):
+        self.started.set()
+        self.release.wait(5)
+        self.batches.append([float(v[0]) for v in x])
+        return x.copy()
+
+def _frame(value):
+    return np.full(1, value, dtype=np.float32)
+
+def _block(scheduler, clf):
+    """Keep the scheduler busy so the next frames queue up together."""
+    first = scheduler.submit("warm-up", _frame(-1))
+    assert clf.started.wait(5)
+    return first
+
+def test_sessions_are_drained_round_robin():
+    clf = GatedClassifier()
+    scheduler = BatchScheduler(clf, max_batch=3, max_wait_ms=100, max_pending=3)
+    _block(scheduler, clf)
+
+    futures = [scheduler.submit("a", _frame(v)) for v in (1, 2, 3)]       # a fast client
+    futures += [scheduler.submit("b", _frame(10)), scheduler.submit("c", _frame(20))]
+    clf.release.set()
+
+    assert [float(f.result(5)[0]) for f in futures] == [1, 2, 3, 10, 20]
+    assert clf.batches[1] == [1, 10, 20]                # one frame per session per turn
+    assert clf.batches[2] == [2, 3]
+
+def test_overflowing_session_cancels_its_oldest_frame():
+    clf = GatedClassifier()
+    scheduler = BatchScheduler(clf, max_batch=8, max_wait_ms=1, max_pending=2)
+    _block(scheduler, clf)
+
+    oldest, *rest = [scheduler.submit("a", _frame(v)) for v in (1, 2, 3)]
+    clf.release.set()
+
+    with pytest.raises(CancelledError):
+        oldest.result(5)
+    assert [float(f.result(5)[0]) for f in rest] == [2, 3]
+    assert scheduler.stats()["cancelled"] == 1
+
+def test_partial_batch_is_dispatched_after_max_wait():
+    clf = GatedClassifier()
+    clf.release.set()
+    scheduler = BatchScheduler(clf, max_batch=16, max_wait_ms=50, max_pending=2)
+
+    start = time.perf_counter()
+    assert float(scheduler.submit("a", _frame(1)).result(5)[0]) == 1
+    waited = time.perf_counter() - start
+    assert 0.04 <= waited < 2.0
+    assert clf.batches == [[1]]
@@ -0,0 +1,127 @@
+import builtins
+import threading
+import cv2
+import numpy as np
+import pytest
+
+from io import BytesIO
+from pathlib import Path
+from PIL import Image
+
+from utils import capture_store
+from utils.capture_store import CaptureWriter, put_bytes, put_image
+from utils.history_store import HistoryStore
+
+@pytest.fixture
+def blobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(capture_store, "BLOB_DIR", tmp_path / "blobs")
+    yield tmp_path / "blobs"
+    capture_store.flush()                   # don't leave writes queued for the next test
+
+def _picture():
+    rgb = np.random.default_rng(0).integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+    buf = BytesIO()
+    Image.fromarray(rgb).save(buf, format="PNG")
+    return rgb, buf.getvalue()
+
+def test_same_bytes_are_one_blob_kept_as_is(blobs):
+    _, png = _picture()
+    paths = {put_bytes(png, ".png"), put_bytes(png, ".jpg"), put_image(png)}
+    assert capture_store.flush()
+    assert len(paths) == 1
+    blob = Path(paths.pop())
+    assert blob.suffix == ".png" and blob.read_bytes() == png   # the first copy decides the extension
+    assert [p for p in blobs.rglob("*") if p.is_file()] == [blob]
+
+def test_same_frame_from_opencv_or_pil_is_one_blob(blobs):
+    rgb, _ = _picture()
+    assert put_image(Image.fromarray(rgb)) == put_image(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+
+def test_saving_bytes_does_not_decode_them(blobs, monkeypatch):
+    def no_decode(*args, **kwargs):
+        raise AssertionError("decoded on the caller's thread")
+
+    monkeypatch.setattr(Image, "open", no_decode)
+    _, png = _picture()
+    path = Path(put_bytes(png, ".png"))
+    assert capture_store.flush() and path.read_bytes() == png
+
+def test_file_copy_is_read_on_the_writer_thread(blobs, tmp_path, monkeypatch):
+    _, png = _picture()
+    source = tmp_path / "upload.png"
+    source.write_bytes(png)
+    readers = []
+    read_bytes = Path.read_bytes
+
+    def tracking_read_bytes(self):
+        readers.append(threading.current_thread().name)
+        return read_bytes(self)
+
+    monkeypatch.setattr(Path, "read_bytes", tracking_read_bytes)
+    path = Path(put_image(source))
+    assert capture_store.flush()
+    assert readers == ["capture-writer"]
+    assert read_bytes(path) == png
+
+def test_different_pictures_get_different_blobs(blobs):
+    rgb, _ = _picture()
+    assert put_image(rgb) != put_image(255 - rgb)
+
+def test_failed_fsync_closes_files_and_removes_temp_files(tmp_path, monkeypatch):
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        f = builtins.open(*args, **kwargs)
+        if str(args[0]).startswith(str(tmp_path)):
+            opened.append(f)
+        return f
+
+    def failing_fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(capture_store, "open", tracking_open, raising=False)
+    monkeypatch.setattr(capture_store.os, "fsync", failing_fsync)
+    writer = CaptureWriter()
+    batch = [(tmp_path / f"{i}.jpg", lambda: b"data") for i in range(3)]
+
+    with pytest.raises(OSError):
+        writer._write_batch(batch)
+    assert len(opened) == 3 and all(f.closed for f in opened)
+    assert list(tmp_path.iterdir()) == []
+
+def _legacy(tmp_path, monkeypatch):
+    folder = tmp_path / "captures" / "upload"
+    folder.mkdir(parents=True)
+    monkeypatch.setattr(capture_store, "LEGACY_DIRS", (folder,))
+    _, png = _picture()
+    original = folder / "a.png"
+    original.write_bytes(png)
+    store = HistoryStore(tmp_path / "history.db", legacy_json=None)
+    store.append("upload", {"file": "a.png", "image": str(original), "prediction": "A"})
+    return original, png, store
+
+def test_migrate_moves_originals_into_blobs(blobs, tmp_path, monkeypatch):
+    original, png, store = _legacy(tmp_path, monkeypatch)
+    stats = capture_store.migrate(store)
+    assert stats["files"] == 1 and stats["failed"] == 0
+    assert not original.exists()
+    blob = Path(store.records("upload")[0]["image"])
+    assert blob.read_bytes() == png
+
+def test_migrate_keeps_originals_it_could_not_store(tmp_path, monkeypatch):
+    original, png, store = _legacy(tmp_path, monkeypatch)
+    unwritable = tmp_path / "blobs"
+    unwritable.write_text("a file where the blob directory should be")
+    monkeypatch.setattr(capture_store, "BLOB_DIR", unwritable)
+
+    stats = capture_store.migrate(store)
+    assert stats["failed"] == 1 and stats["files"] == 0
+    assert original.read_bytes() == png
+    assert store.records("upload")[0]["image"] == str(original)
+
+def test_waiting_put_raises_when_the_blob_cannot_be_written(tmp_path, monkeypatch):
+    unwritable = tmp_path / "blobs"
+    unwritable.write_text("")
+    monkeypatch.setattr(capture_store, "BLOB_DIR", unwritable)
+    with pytest.raises(OSError):
+        put_bytes(_picture()[1], ".png", wait=True)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from PIL import Image
+
+pytest.importorskip("tensorflow")       # the training pipeline is tf.data only
+
+from src import data
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    """Two-class image folder and a disk cache private to the test."""
+    monkeypatch.setattr(data, "DATA_CACHE", "disk")
+    monkeypatch.setattr(data, "DATA_CACHE_DIR", tmp_path / "cache")
+    root = tmp_path / "train"
+    rng = np.random.default_rng(0)
+    for name in ("B", "A"):
+        (root / name).mkdir(parents=True)
+        for i in range(3):
+            Image.fromarray(rng.integers(0, 256, size=(40, 50, 3), dtype=np.uint8)).save(root / name / f"{i}.png")
+    (root / "A" / "notes.txt").write_text("not an image")
+    return root
+
+def _images(ds):
+    return np.concatenate([x.numpy() for x, _ in ds])
+
+def test_list_files_sorts_classes_and_files(dataset):
+    paths, labels, class_names = data._list_files(str(dataset))
+    assert class_names == ["A", "B"]
+    assert labels == [0, 0, 0, 1, 1, 1]
+    assert paths == sorted(paths) and all(p.endswith(".png") for p in paths)
+
+def test_disk_cache_serves_the_same_images_again(dataset, tmp_path):
+    paths, labels, _ = data._list_files(str(dataset))
+    ds = data._make_dataset(paths, labels, "val")
+
+    first = _images(ds)
+    assert first.shape == (6, *data.IMAGE_SIZE, 3)
+    assert first.min() >= -1.0 and first.max() <= 1.0    # standardized after the uint8 cache
+    assert len(list((tmp_path / "cache").glob("val-*.index"))) == 1
+    np.testing.assert_array_equal(_images(ds), first)
+
+def test_disk_cache_is_keyed_on_the_file_list(dataset, tmp_path):
+    paths, labels, _ = data._list_files(str(dataset))
+    _images(data._make_dataset(paths, labels, "val"))
+    _images(data._make_dataset(paths[:4], labels[:4], "val"))
+    assert len(list((tmp_path / "cache").glob("val-*.index"))) == 2
+
+def test_stale_lock_file_is_removed(dataset, tmp_path):
+    paths, labels, _ = data._list_files(str(dataset))
+    _images(data._make_dataset(paths, labels, "val"))
+    index = next((tmp_path / "cache").glob("val-*.index"))
+    lock = index.with_name(f"{index.stem}_0.lockfile")
+    lock.write_text("")                     # left by a run killed mid-epoch
+
+    data._make_dataset(paths, labels, "val")
+    assert not lock.exists()
+
+def test_unknown_cache_mode_is_rejected(dataset, monkeypatch):
+    monkeypatch.setattr(data, "DATA_CACHE", "ssd")
+    paths, labels, _ = data._list_files(str(dataset))
+    with pytest.raises(ValueError):
+        data._make_dataset(paths, labels, "val")
@@ -0,0 +1,40 @@
+import os
+
+from utils import dictionary
+from utils.dictionary import LocalSource
+
+def _write(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+def test_custom_list_survives_a_changed_bundled_list(tmp_path, monkeypatch):
+    bundled = _write(tmp_path / "words.tsv", ["cat\tA small pet."])
+    custom = _write(tmp_path / "custom.tsv", ["cab\tA taxi.", "cat\tA feline."])
+    index = tmp_path / "dictionary.db"
+    monkeypatch.setattr(dictionary, "DICTIONARY_WORDS", bundled)
+
+    assert LocalSource(index_path=index).words() == ["cat"]
+    LocalSource(custom, index_path=index)                   # `build custom.tsv`
+
+    # The bundled list changes (e.g. a git pull); the app must keep the custom index
+    _write(bundled, ["cat\tA small pet.", "dog\tA pet."])
+    os.utime(bundled, ns=(0, 10**18))
+    app = LocalSource(index_path=index)
+    assert app.words_path == custom.resolve()
+    assert app.words() == ["cab", "cat"]
+    assert app.lookup("cat") == "A feline."
+
+def test_recorded_list_is_reindexed_when_it_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(dictionary, "DICTIONARY_WORDS", tmp_path / "missing.tsv")
+    custom = _write(tmp_path / "custom.tsv", ["cab"])
+    index = tmp_path / "dictionary.db"
+    LocalSource(custom, index_path=index)
+
+    _write(custom, ["cab", "kim"])
+    os.utime(custom, ns=(0, 10**18))
+    assert LocalSource(index_path=index).words() == ["cab", "kim"]
+
+def test_bare_words_have_no_definition(tmp_path):
+    source = LocalSource(_write(tmp_path / "w.tsv", ["# comment", "bob", "cat\tA pet."]), tmp_path / "d.db")
+    assert "bob" in source and source.lookup("bob") is None
+    assert source.lookup("cat") == "A pet."
@@ -0,0 +1,82 @@
+import numpy as np
+
+from src.config import STABLE_FRAMES
+from src.gating import FrameGate, gate_frame, skin_mask
+from src.smoothing import StreamDecoder
+
+CLASSES = ["A", "B", "nothing"]
+
+def _hand_frame():
+    """A frame that is mostly skin-coloured, so the gate sees a hand."""
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    frame[20:100, 40:120] = (100, 140, 200)        # BGR skin tone
+    return frame
+
+def _probs(label, confidence=0.9):
+    p = np.full(len(CLASSES), (1.0 - confidence) / (len(CLASSES) - 1), dtype=np.float32)
+    p[CLASSES.index(label)] = confidence
+    return p
+
+def test_frame_is_a_hand():
+    assert np.count_nonzero(skin_mask(_hand_frame())) > 0
+
+def test_held_sign_becomes_stable_without_rerunning_the_model():
+    gate = FrameGate(refresh_seconds=60.0)
+    decoder = StreamDecoder(CLASSES, fast_interval=1 / 30)
+    calls = []
+
+    def submit(frame):
+        # Synchronous stand-in for the inference worker
+        calls.append(frame)
+        decoder.update(_probs("A"), payload=frame)
+
+    frame = _hand_frame()
+    decisions = [gate_frame(gate, decoder, frame, submit) for _ in range(STABLE_FRAMES)]
+
+    assert decisions[0] == FrameGate.INFER
+    assert set(decisions[1:]) == {FrameGate.STATIC}
+    assert len(calls) == 1
+    # Stable within STABLE_FRAMES samples, i.e. about STABLE_FRAMES * sample_interval
+    assert decoder.stable_label == "A"
+    label, payload, _ = decoder.pop_stable()
+    assert label == "A" and payload is frame
+
+def test_empty_frame_reports_nothing_with_the_skin_check():
+    gate = FrameGate(skin_check=True)
+    decoder = StreamDecoder(CLASSES)
+    nothing = _probs("nothing", 1.0)
+    decision = gate_frame(gate, decoder, np.zeros((120, 160, 3), np.uint8), lambda f: None, nothing=nothing)
+    assert decision == FrameGate.EMPTY
+    assert decoder.label == "nothing"
+
+def test_without_the_skin_check_a_dark_frame_still_goes_to_the_model():
+    submitted = []
+    decision = gate_frame(FrameGate(skin_check=False), StreamDecoder(CLASSES),
+                          np.zeros((120, 160, 3), np.uint8), submitted.append)
+    assert decision == FrameGate.INFER and len(submitted) == 1
+
+def test_static_frames_wait_for_the_result_still_in_flight():
+    gate = FrameGate(refresh_seconds=60.0)
+    decoder = StreamDecoder(CLASSES, fast_interval=1 / 30)
+    in_flight = []                          # asynchronous worker: results land later
+
+    gate_frame(gate, decoder, _hand_frame(), in_flight.append)
+    decoder.update(_probs("A"), payload=in_flight.pop())
+
+    # The hand moves to "B": static frames before B's result must not re-count "A"
+    moved = np.roll(_hand_frame(), 60, axis=1)
+    assert gate_frame(gate, decoder, moved, in_flight.append) == FrameGate.INFER
+    for _ in range(STABLE_FRAMES):
+        assert gate_frame(gate, decoder, moved, in_flight.append) == FrameGate.STATIC
+    assert len(decoder.ring) == 1 and decoder.stable_label is None
+
+    # Once B's result lands, static frames count it
+    decoder.update(_probs("B"), payload=in_flight.pop())
+    for _ in range(STABLE_FRAMES):
+        gate_frame(gate, decoder, moved, in_flight.append)
+    assert decoder.stable_label == "B"
+
+def test_repeat_before_any_update_is_a_no_op():
+    decoder = StreamDecoder(CLASSES)
+    assert decoder.repeat() is None
+    assert decoder.label is None
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src import hand_crop
+from src.hand_crop import HandTracker, crop_box, crop_hand, detect_hand
+
+SKIN = (100, 140, 200)                  # BGR skin tone, see src/gating.py
+
+def _frame(x=200, y=100, size=120, shape=(480, 640, 3)):
+    frame = np.zeros(shape, dtype=np.uint8)
+    frame[y:y + size, x:x + size] = SKIN
+    return frame
+
+def test_detect_hand_finds_the_skin_blob_in_full_resolution_pixels():
+    x, y, w, h = detect_hand(_frame())
+    assert (x, y, w, h) == pytest.approx((200, 100, 120, 120), abs=8)
+
+def test_no_hand_leaves_the_image_alone():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    assert detect_hand(frame) is None
+    assert crop_hand(frame) is frame
+
+def test_crop_is_a_padded_square_clamped_to_the_image():
+    frame = _frame()
+    crop = crop_box(frame, (200, 100, 120, 60), padding=0.25)
+    assert crop.shape[:2] == (180, 180)                 # longest side + 25% each way
+
+    corner = crop_box(frame, (0, 0, 100, 100), padding=0.25)
+    assert corner.shape[:2] == (125, 125)               # clamped at the top-left edge
+
+def test_tracker_reuses_its_box_between_detections(monkeypatch):
+    calls = []
+    detect = hand_crop.detect_hand
+    monkeypatch.setattr(hand_crop, "detect_hand", lambda *a, **k: calls.append(1) or detect(*a, **k))
+
+    tracker = HandTracker(redetect_every=3, smoothing=0.5)
+    frames = [_frame()] * 8
+    crops = [tracker.crop(f) for f in frames]
+    assert len(calls) == 2                              # frame 1 and after 3 reused boxes
+    assert all(c.shape == crops[0].shape for c in crops)
+
+def test_tracker_blends_new_detections_into_its_box():
+    tracker = HandTracker(redetect_every=0, smoothing=0.5)
+    first = tracker.update(_frame(x=200)).copy()
+    moved = tracker.update(_frame(x=300))
+    assert first[0] < moved[0] < first[0] + 100         # halfway, not a jump to the new box
+    assert tracker.update(np.zeros((480, 640, 3), np.uint8)) is None
@@ -0,0 +1,24 @@
+from utils.history_store import HistoryStore, projection
+
+def _store(tmp_path):
+    return HistoryStore(tmp_path / "history.db", legacy_json=None)
+
+def test_word_tab_projects_word_letters_and_meaning(tmp_path):
+    store = _store(tmp_path)
+    store.append("word", {
+        "word": "CAB", "meaning": "A taxi.", "file": "CAB.jpg", "timestamp": "2026-01-02 10:00:00",
+        "letters": [{"label": "C"}, {"label": "A"}, {"label": "B"}],
+    })
+    store.append("word", {"word": "HI", "meaning": "A greeting.", "letters": ["H", "I"],   # legacy format
+                          "timestamp": "2026-01-01 10:00:00"})
+
+    rows = [dict(zip(projection("word"), row)) for row in store.query("word")]
+    assert [r["word"] for r in rows] == ["CAB", "HI"]
+    assert [r["letters"] for r in rows] == ["CAB", "HI"]
+    assert rows[0]["meaning"] == "A taxi." and rows[0]["file"] == "CAB.jpg"
+    assert store.count("word", predictions=["HI"]) == 1
+
+def test_upload_tab_keeps_the_indexed_columns(tmp_path):
+    store = _store(tmp_path)
+    store.append("upload", {"prediction": "A", "confidence": 0.9, "file": "a.jpg", "timestamp": "2026-01-01 10:00:00"})
+    assert store.query("upload") == [(1, "2026-01-01 10:00:00", "A", 0.9, "a.jpg")]
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.infer import ASLClassifier, Prediction
+
+CLASSES = ["A", "B", "C", "D", "E"]
+
+def _prediction(values):
+    return Prediction(np.float32(values), CLASSES)
+
+def test_prediction_label_and_confidence_follow_the_argmax():
+    p = _prediction([0.1, 0.05, 0.6, 0.2, 0.05])
+    assert (p.label, p.index) == ("C", 2)
+    assert p.confidence == pytest.approx(0.6)
+
+def test_top_k_is_sorted_highest_first_and_capped_at_the_class_count():
+    vector = np.random.default_rng(0).random(len(CLASSES)).astype(np.float32)
+    p = Prediction(vector, CLASSES)
+    expected = sorted(zip(CLASSES, vector.tolist()), key=lambda t: -t[1])
+
+    assert p.top_k(3) == [(label, pytest.approx(conf)) for label, conf in expected[:3]]
+    assert len(p.top_k(50)) == len(CLASSES)
+    assert p.top_k_dicts(1) == [{"label": expected[0][0], "confidence": pytest.approx(expected[0][1])}]
+
+def test_prediction_keeps_the_old_dict_access():
+    p = _prediction([0.7, 0.1, 0.1, 0.05, 0.05])
+    assert p["label"] == "A" and p["index"] == 0
+    assert p["probs"] == {name: pytest.approx(v) for name, v in zip(CLASSES, [0.7, 0.1, 0.1, 0.05, 0.05])}
+    assert dict(p) == p.to_dict() and set(p) == {"label", "index", "confidence", "probs"}
+    with pytest.raises(KeyError):
+        p["vector"]
+
+def test_classifier_result_and_predict_batch_chunks():
+    calls = []
+    clf = ASLClassifier.__new__(ASLClassifier)
+    clf.class_names = CLASSES
+    clf.backend = lambda x: calls.append(len(x)) or np.tile(np.eye(5, dtype=np.float32)[1], (len(x), 1))
+
+    assert clf.result(np.eye(5, dtype=np.float32)[3]).label == "D"
+    images = [np.zeros((20, 20, 3), dtype=np.uint8)] * 5
+    results = clf.predict_batch(images, batch_size=2)
+    assert [r.label for r in results] == ["B"] * 5
+    assert calls == [2, 2, 1]
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+import pytest
+
+from PIL import Image
+
+from src.preprocess import IMG_SIZE, Preprocessor, standardize_, standardize_tf, check_parity
+
+def _reference(x):
+    """MobileNetV2 input range: [0, 255] -> [-1, 1]."""
+    return (np.asarray(x, dtype=np.float32) / 255.0 - 0.5) * 2.0
+
+def _random_image(shape, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=shape, dtype=np.uint8)
+
+# ----------------------------
+# NumPy (serving) half
+# ----------------------------
+def test_standardize_matches_reference_formula():
+    x = _random_image((4, 32, 32, 3)).astype(np.float32)
+    expected = _reference(x)
+    out = standardize_(x.copy())
+    assert out.dtype == np.float32
+    np.testing.assert_array_equal(out, expected)
+
+def test_standardize_maps_the_full_range_to_minus_one_one():
+    out = standardize_(np.array([0.0, 127.5, 255.0], dtype=np.float32))
+    np.testing.assert_array_equal(out, np.array([-1.0, 0.0, 1.0], dtype=np.float32))
+
+@pytest.mark.parametrize("as_pil", [True, False])
+def test_preprocessor_is_area_resize_then_standardize(as_pil):
+    rgb = _random_image((240, 320, 3), seed=1)
+    img = Image.fromarray(rgb) if as_pil else cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+    out = Preprocessor().one(img)
+
+    expected = _reference(cv2.resize(rgb, IMG_SIZE[::-1], interpolation=cv2.INTER_AREA))
+    assert out.shape == (1, *IMG_SIZE, 3)
+    assert out.min() >= -1.0 and out.max() <= 1.0
+    np.testing.assert_array_equal(out[0], expected)
+
+# ----------------------------
+# TensorFlow (training) half
+# ----------------------------
+def test_standardize_tf_is_bit_identical_to_numpy():
+    tf = pytest.importorskip("tensorflow")
+    x = _random_image((2, *IMG_SIZE, 3), seed=2)
+    np.testing.assert_array_equal(standardize_tf(tf.constant(x)).numpy(), standardize_(x.astype(np.float32)))
+
+def test_check_parity_on_synthetic_files(tmp_path):
+    pytest.importorskip("tensorflow")
+    paths = []
+    for seed in range(3):
+        path = tmp_path / f"{seed}.png"
+        Image.fromarray(cv2.GaussianBlur(_random_image((200, 200, 3), seed), (9, 9), 3)).save(path)
+        paths.append(path)
+    assert check_parity(paths) <= 4.0 / 255.0
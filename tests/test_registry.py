@@ -0,0 +1,58 @@
+import os
+import pytest
+
+from src import infer
+from src.registry import ModelRegistry
+
+class FakeClassifier:
+    """Stands in for ASLClassifier: 'loads' the model file's text, fails on "broken"."""
+    def __init__(self, model_path, class_map_path, backend=None):
+        text = open(model_path).read()
+        if text == "broken":
+            raise ValueError("bad model file")
+        self.weights = text
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    monkeypatch.setattr(infer, "ASLClassifier", FakeClassifier)
+    path = tmp_path / "model.keras"
+    path.write_text("v1")
+    return path
+
+def _rewrite(path, text):
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))   # a new mtime, even on coarse clocks
+
+def test_model_is_loaded_once_and_reloaded_when_the_file_changes(model):
+    registry, events = ModelRegistry(), []
+    registry.add_hook(lambda e: events.append(e["event"]))
+
+    first = registry.get(model, "classes.json", "keras")
+    assert registry.get(model, "classes.json", "keras") is first
+
+    _rewrite(model, "v1")                   # touched, same content
+    assert registry.get(model, "classes.json", "keras") is first
+
+    _rewrite(model, "v2")
+    second = registry.get(model, "classes.json", "keras")
+    assert second is not first and second.weights == "v2"
+    assert events == ["load", "reload"]
+
+def test_removed_model_file_keeps_the_loaded_model(model):
+    registry = ModelRegistry()
+    clf = registry.get(model, "classes.json", "keras")
+    model.unlink()
+    assert registry.get(model, "classes.json", "keras") is clf
+
+def test_failed_reload_keeps_the_current_model(model):
+    registry = ModelRegistry()
+    clf = registry.get(model, "classes.json", "keras")
+
+    _rewrite(model, "broken")
+    with pytest.raises(ValueError):
+        registry.reload(model, "classes.json", "keras")
+    assert registry.get(model, "classes.json", "keras") is clf
+
+    _rewrite(model, "v2")                   # fixed on disk: picked up again
+    assert registry.get(model, "classes.json", "keras").weights == "v2"
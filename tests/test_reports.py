@@ -0,0 +1,48 @@
+import pytest
+
+from src.cache import LRUCache
+from utils import reports
+from utils.reports import get_report, report_key
+
+@pytest.fixture
+def report_dirs(tmp_path, monkeypatch):
+    """Reports, their scaled images and the job registry private to one test."""
+    monkeypatch.setattr(reports, "REPORT_DIR", tmp_path / "reports")
+    monkeypatch.setattr(reports, "REPORT_IMAGE_DIR", tmp_path / "report_images")
+    monkeypatch.setattr(reports, "_IMAGES", None)
+    monkeypatch.setattr(reports, "_JOBS", LRUCache(reports.REPORT_MAX_FILES))
+    return tmp_path
+
+def _word(**fields):
+    return {"id": 7, "word": "CAB", "meaning": "A taxi.", "letters": [{"label": "C"}], "images": [], **fields}
+
+def test_report_key_changes_when_a_record_is_edited():
+    assert report_key("word", [_word()]) == report_key("word", [_word()])
+    assert report_key("word", [_word()]) != report_key("word", [_word(word="CAR")])
+    assert report_key("word", [_word()]) != report_key("upload", [_word()])
+
+def test_edited_record_gets_a_new_report(report_dirs):
+    pytest.importorskip("fpdf")
+
+    first = get_report("word", [_word()])
+    assert first._done.wait(30) and first.error is None
+    assert get_report("word", [_word()]) is first
+
+    edited = get_report("word", [_word(word="CAR", meaning="A vehicle.")])
+    assert edited is not first
+    assert edited._done.wait(30) and edited.error is None
+    assert edited.path != first.path
+    assert first.path.exists() and edited.path.exists()
+
+def test_unreadable_image_is_reported_not_embedded(report_dirs):
+    pytest.importorskip("fpdf")
+    broken = report_dirs / "broken.jpg"
+    broken.write_bytes(b"not a jpeg")
+    records = [{"id": 1, "file": "broken.jpg", "image": str(broken), "prediction": "A", "confidence": 0.9},
+               {"id": 2, "file": "gone.jpg", "image": str(report_dirs / "gone.jpg"), "prediction": "B",
+                "confidence": 0.8}]
+
+    job = get_report("upload", records)
+    assert job._done.wait(30) and job.error is None
+    assert job.unreadable == {str(broken)}
+    assert job.path.exists()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.smoothing import StreamDecoder
+
+CLASSES = ["A", "B", "nothing"]
+
+def _probs(label, confidence=0.9):
+    p = np.full(len(CLASSES), (1.0 - confidence) / (len(CLASSES) - 1), dtype=np.float32)
+    p[CLASSES.index(label)] = confidence
+    return p
+
+def _decoder(**kwargs):
+    return StreamDecoder(CLASSES, alpha=0.5, stable_frames=3, min_confidence=0.6,
+                         drift_threshold=0.5, fast_interval=0.0, slow_interval=0.5, **kwargs)
+
+def test_ema_smooths_a_single_outlier():
+    decoder = _decoder()
+    decoder.update(_probs("A"))
+    decoder.update(_probs("A"))
+    decoder.update(_probs("B", 0.6))
+    assert decoder.label == "A"
+    assert decoder.ema == pytest.approx(0.25 * _probs("A") + 0.25 * _probs("A") + 0.5 * _probs("B", 0.6))
+
+def test_letter_is_stable_after_stable_frames_agreeing_updates():
+    decoder = _decoder()
+    assert [decoder.update(_probs("A"), payload=i) for i in range(3)] == [None, None, "A"]
+    assert decoder.stable_label == "A" and decoder.sample_interval == 0.5
+
+    label, payload, probs = decoder.pop_stable()
+    assert (label, payload) == ("A", 2) and probs.argmax() == 0
+    assert decoder.pop_stable() is None
+
+def test_disagreeing_frame_in_the_ring_blocks_stability():
+    decoder = _decoder()
+    for label in ("A", "B", "A", "A"):
+        decoder.update(_probs(label, 0.7))
+    assert decoder.stable_label is None                 # "B" is still among the last 3
+    decoder.update(_probs("A", 0.7))
+    assert decoder.stable_label == "A"
+
+def test_low_confidence_never_becomes_stable():
+    decoder = _decoder()
+    for _ in range(10):
+        decoder.update(_probs("A", 0.5))
+    assert decoder.label == "A" and decoder.stable_label is None
+
+def test_drift_releases_the_letter_and_it_is_emitted_again_later():
+    decoder = _decoder()
+    for _ in range(3):
+        decoder.update(_probs("A"))
+    for _ in range(5):
+        assert decoder.update(_probs("A")) is None      # held: not emitted twice
+    decoder.update(_probs("B"))
+    assert decoder.stable_label is None and decoder.sample_interval == 0.0
+
+    results = [decoder.update(_probs("A")) for _ in range(3)]
+    assert results[-1] == "A"
+    assert [decoder.pop_stable()[0] for _ in range(2)] == ["A", "A"]
+
+def test_reset_forgets_everything():
+    decoder = _decoder()
+    for _ in range(3):
+        decoder.update(_probs("A"))
+    decoder.expect()
+    decoder.reset()
+    assert decoder.label is None and decoder.stable_label is None and decoder.pop_stable() is None
+    decoder.update(_probs("B"))
+    decoder.repeat()                        # works as on a new decoder
+    assert len(decoder.ring) == 2 and decoder.label == "B"
@@ -0,0 +1,46 @@
+import string
+import numpy as np
+
+from src.spelling import Speller
+
+CLASSES = list(string.ascii_uppercase) + ["del", "nothing", "space"]
+LEXICON = ["boy", "box", "kid", "him", "car", "can", "cat", "hat", "hello", "help"]
+
+def _probs(word, confidence=0.95, unsure=None):
+    """One vector per letter; `unsure` = {position: (runner_up, p_letter, p_runner_up)}."""
+    vectors = []
+    for i, ch in enumerate(word.upper()):
+        p = np.full(len(CLASSES), (1.0 - confidence) / (len(CLASSES) - 1))
+        p[CLASSES.index(ch)] = confidence
+        if unsure and i in unsure:
+            alt, p_letter, p_alt = unsure[i]
+            p[:] = (1.0 - p_letter - p_alt) / (len(CLASSES) - 2)
+            p[CLASSES.index(ch)], p[CLASSES.index(alt)] = p_letter, p_alt
+        vectors.append(p)
+    return np.stack(vectors)
+
+def test_confident_out_of_lexicon_spellings_survive():
+    speller = Speller(LEXICON)
+    for word in ["bob", "kim", "cab"]:
+        candidates = speller.decode(_probs(word), CLASSES, top_n=3)
+        assert candidates[0].word == word
+        assert candidates[0].signed and not candidates[0].in_lexicon
+
+def test_signed_lexicon_word_is_suggested():
+    candidates = Speller(LEXICON).decode(_probs("cat"), CLASSES, top_n=3)
+    assert candidates[0].word == "cat"
+    assert candidates[0].signed and candidates[0].in_lexicon
+
+def test_unsure_letter_is_corrected_but_signed_word_is_kept():
+    # W signed at 0.50 with E at 0.45: "hwllo" is most likely "hello"
+    probs = _probs("hwllo", unsure={1: ("E", 0.50, 0.45)})
+    candidates = Speller(LEXICON).decode(probs, CLASSES, top_n=1)
+    assert [c.word for c in candidates] == ["hello", "hwllo"]
+    assert candidates[1].signed
+
+def test_signed_word_always_in_top_n():
+    speller = Speller(LEXICON)
+    for word in ["bob", "kim", "cab", "cat", "zzz"]:
+        candidates = speller.decode(_probs(word, confidence=0.6), CLASSES, top_n=3)
+        assert word in [c.word for c in candidates]
+        assert sum(c.signed for c in candidates) == 1
@@ -0,0 +1,57 @@
+import threading
+import numpy as np
+
+from pathlib import Path
+from PIL import Image
+
+from utils.thumbnails import ThumbnailCache
+
+def _image(tmp_path, name="a.png", seed=0):
+    path = tmp_path / name
+    rgb = np.random.default_rng(seed).integers(0, 256, size=(120, 160, 3), dtype=np.uint8)
+    Image.fromarray(rgb).save(path)
+    return path
+
+def _disk_bytes(cache):
+    return sum(p.stat().st_size for p in cache.root.iterdir() if p.suffix == cache.ext)
+
+def test_concurrent_misses_render_once(tmp_path):
+    cache = ThumbnailCache(tmp_path / "thumbs", workers=4, fmt="JPEG")
+    path = _image(tmp_path)
+    start = threading.Barrier(16)
+    results = []
+
+    def request():
+        start.wait()
+        for _ in range(20):
+            results.append(cache.get(path, 64))
+
+    threads = [threading.Thread(target=request) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert len(set(results)) == 1
+    assert stats["misses"] == 1 and stats["files"] == 1
+    assert stats["bytes"] == _disk_bytes(cache)
+
+def test_rerendering_a_key_does_not_double_count_bytes(tmp_path):
+    cache = ThumbnailCache(tmp_path / "thumbs", fmt="JPEG")
+    path = _image(tmp_path)
+    name = cache._key(path, 64)
+    cache._render(path, name, 64)
+    cache._render(path, name, 64)           # e.g. two racing misses for the same key
+    assert cache.stats() == {"files": 1, "bytes": _disk_bytes(cache), "hits": 0, "misses": 0}
+
+def test_budget_evicts_least_recently_used(tmp_path):
+    cache = ThumbnailCache(tmp_path / "thumbs", fmt="JPEG")
+    paths = [_image(tmp_path, f"{i}.png", seed=i) for i in range(3)]
+    one = cache.get(paths[0], 64)
+    cache.max_bytes = 2 * Path(one).stat().st_size + 64
+    cache.get(paths[1], 64)
+    cache.get(paths[0], 64)                 # touch: paths[1] is now the oldest
+    cache.get(paths[2], 64)
+    assert cache.stats()["bytes"] == _disk_bytes(cache) <= cache.max_bytes
+    assert cache.get(paths[0], 64) == one and cache.stats()["hits"] >= 2
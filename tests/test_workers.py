@@ -0,0 +1,87 @@
+import time
+import threading
+import numpy as np
+
+from concurrent.futures import Future
+
+from src.infer import ASLClassifier
+from src.workers import InferenceWorker
+
+CLASSES = ["A", "B", "C"]
+
+class GatedClassifier(ASLClassifier):
+    """Frame value v -> one-hot class v; every call waits for `release`."""
+    def __init__(self):
+        self.class_names = CLASSES
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+
+    def predict_probs(self, x):
+        self.started.release()
+        self.release.wait(5)
+        return np.eye(len(CLASSES), dtype=np.float32)[[int(v) for v in x.reshape(len(x), -1)[:, 0]]]
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+def _frame(value):
+    return np.full((2, 2), value, dtype=np.float32)
+
+def test_frames_waiting_behind_a_busy_model_are_dropped_not_queued():
+    clf = GatedClassifier()
+    seen = []
+    worker = InferenceWorker(clf, lambda f: f[None], on_result=lambda frame, probs: seen.append(frame[0, 0]))
+    try:
+        worker.submit(_frame(0))
+        assert clf.started.acquire(timeout=5)          # the model is busy with frame 0
+        for value in (1, 1, 2):
+            worker.submit(_frame(value))
+        clf.release.set()
+
+        assert _wait_for(lambda: worker.inferred == 2)
+        assert worker.stats()["submitted"] == 4 and worker.stats()["dropped"] == 2
+        assert seen == [0, 2]                           # only the newest waiting frame ran
+        assert worker.latest.label == "C" and worker.error is None
+    finally:
+        worker.stop()
+
+def test_cancelled_scheduler_frame_counts_as_dropped():
+    class CancellingScheduler:
+        def submit(self, session_id, x):
+            future = Future()
+            future.cancel()
+            return future
+
+    clf = GatedClassifier()
+    worker = InferenceWorker(clf, lambda f: f[None], scheduler=CancellingScheduler())
+    try:
+        worker.submit(_frame(0))
+        assert _wait_for(lambda: worker.dropped == 1)
+        assert worker.inferred == 0 and worker.latest is None
+    finally:
+        worker.stop()
+
+def test_model_errors_are_reported_and_the_worker_keeps_going():
+    clf = GatedClassifier()
+    clf.release.set()
+    calls = []
+
+    def preprocess(frame):
+        calls.append(frame)
+        if len(calls) == 1:
+            raise ValueError("bad frame")
+        return frame[None]
+
+    worker = InferenceWorker(clf, preprocess)
+    try:
+        worker.submit(_frame(0))
+        assert _wait_for(lambda: worker.inferred == 1)
+        assert worker.error == "bad frame"
+        worker.submit(_frame(1))
+        assert _wait_for(lambda: worker.inferred == 2)
+        assert worker.error is None and worker.latest.label == "B"
+    finally:
+        worker.stop()
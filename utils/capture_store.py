@@ -0,0 +1,432 @@
+import os
+import time
+import queue
+import atexit
+import hashlib
+import argparse
+import threading
+
+from io import BytesIO
+from pathlib import Path, PureWindowsPath
+
+import numpy as np
+
+from utils.history_store import TABS, get_store
+
+# ----------------------------
+# Pathing
+# ----------------------------
+CAPTURE_ROOT = Path("captures")
+BLOB_DIR = CAPTURE_ROOT / "blobs"
+LEGACY_DIRS = (                         # per-page folders from before content addressing
+    CAPTURE_ROOT / "upload",
+    CAPTURE_ROOT / "live",
+    CAPTURE_ROOT / "word_maker",
+    CAPTURE_ROOT / "quiz",
+)
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+JPEG_QUALITY = 95
+GC_GRACE_SECONDS = 3600                 # keep fresh blobs: they may not be in history yet
+CAPTURE_QUEUE_SIZE = 64                 # captures waiting for the writer before callers block
+CAPTURE_FSYNC_BATCH = 16                # files written per fsync round
+CAPTURE_PUT_TIMEOUT = 2.0               # seconds a full queue may block before writing inline
+
+# ----------------------------
+# Background writer
+# ----------------------------
+class CaptureWriter:
+    """
+    Bounded queue + one thread doing all capture disk I/O (encode, write,
+    fsync, rename), so Streamlit reruns return as soon as a capture is queued.
+
+    Jobs are taken in batches of up to `batch_size`: all files of a batch are
+    written first, then fsync'ed, then renamed into place, with one fsync per
+    touched directory. When the queue is full, `submit` blocks for up to
+    `put_timeout` seconds and then writes in the caller (backpressure instead
+    of unbounded memory). `flush` waits for the queue to drain; it also runs at
+    interpreter exit.
+    """
+    def __init__(self, maxsize=CAPTURE_QUEUE_SIZE, batch_size=CAPTURE_FSYNC_BATCH,
+                 put_timeout=CAPTURE_PUT_TIMEOUT):
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.written = 0
+        self.batches = 0
+        self.inline = 0                     # writes done by the caller because the queue was full
+        self.errors = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="capture-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, path, produce):
+        """Queue `produce() -> bytes` to be stored at `path` (skipped if already there)."""
+        path = Path(path)
+        with self._lock:
+            if path in self._pending or path.exists():
+                return
+            self._pending.add(path)
+        try:
+            self._queue.put((path, produce), timeout=self.put_timeout)
+        except queue.Full:
+            self.inline += 1
+            try:
+                self._write_batch([(path, produce)])
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+
+    def pending(self, path):
+        with self._lock:
+            return Path(path) in self._pending
+
+    def write_now(self, path, produce):
+        """Write one capture in the calling thread; raises if it could not be stored."""
+        path = Path(path)
+        self._write_batch([(path, produce)], strict=True)
+        return path
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception:
+                self.errors += 1
+            finally:
+                with self._lock:
+                    self._pending.difference_update(path for path, _ in batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch, strict=False):
+        files = []                          # (path, tmp, open file) written in this batch
+        ok = False
+        try:
+            for path, produce in batch:
+                try:
+                    data = produce()
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                    f = open(tmp, "wb")
+                except Exception:
+                    self.errors += 1
+                    if strict:
+                        raise
+                    continue
+                files.append((path, tmp, f))
+                f.write(data)
+
+            for _, _, f in files:
+                f.flush()
+                os.fsync(f.fileno())
+            ok = True
+        finally:
+            # Never leak handles (or half-written temp files) when a write/fsync fails
+            for _, tmp, f in files:
+                f.close()
+                if not ok:
+                    tmp.unlink(missing_ok=True)
+
+        for path, tmp, _ in files:
+            os.replace(tmp, path)
+        for directory in {path.parent for path, _, _ in files}:
+            _fsync_dir(directory)
+        self.written += len(files)
+        self.batches += 1
+
+    def flush(self, timeout=10.0):
+        """Block until every queued capture is on disk (or `timeout` passes)."""
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(), "written": self.written, "batches": self.batches,
+            "inline": self.inline, "errors": self.errors,
+        }
+
+def _fsync_dir(directory):
+    if not hasattr(os, "O_DIRECTORY"):         # Windows can't open directories
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+_WRITER = None
+_WRITER_LOCK = threading.Lock()
+
+def get_writer():
+    """Process-wide CaptureWriter, started on first use."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = CaptureWriter()
+        return _WRITER
+
+def flush(timeout=10.0):
+    """Wait for queued captures, e.g. before reading them back from disk."""
+    return True if _WRITER is None else _WRITER.flush(timeout)
+
+# ----------------------------
+# Writing blobs
+# ----------------------------
+def blob_path(digest, ext=".jpg"):
+    """captures/blobs/ab/abcdef....jpg"""
+    return BLOB_DIR / digest[:2] / f"{digest}{ext}"
+
+def is_blob(path):
+    try:
+        Path(path).resolve().relative_to(BLOB_DIR.resolve())
+        return True
+    except (TypeError, ValueError):
+        return False
+
+# Captures are addressed by content without decoding anything on the caller's
+# thread: encoded bytes and files by a hash of their bytes, frames and PIL images
+# by a hash of their RGB pixels (so the same frame saved from OpenCV or PIL is one
+# blob). Encoding and disk I/O happen on the writer thread. The first copy stored
+# decides the file extension; later ones reuse that blob.
+_PUT_LOCK = threading.Lock()
+
+def _pixel_digest(rgb):
+    h = hashlib.sha256(f"{rgb.shape}{rgb.dtype}".encode())
+    h.update(np.ascontiguousarray(rgb).data)
+    return h.hexdigest()
+
+def _rgb(img):
+    """uint8 RGB pixels of an OpenCV (BGR / BGRA / gray) array or a PIL image."""
+    if isinstance(img, np.ndarray):
+        import cv2
+        if img.ndim == 2:
+            return cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2RGB if img.shape[2] == 4 else cv2.COLOR_BGR2RGB)
+    return np.asarray(img.convert("RGB") if img.mode != "RGB" else img)
+
+def content_digest(data):
+    """SHA-256 of encoded image bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in chunks (the bytes are not kept)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _existing(digest, writer):
+    """Blob already stored (or queued) for this digest, under any extension."""
+    for ext in IMAGE_EXTS:
+        path = blob_path(digest, ext)
+        if path.exists() or writer.pending(path):
+            return path
+    return None
+
+def _put(digest, ext, produce, wait=False):
+    writer = get_writer()
+    with _PUT_LOCK:
+        path = _existing(digest, writer)
+        if path is None:
+            path = blob_path(digest, ext)
+            if not wait:
+                writer.submit(path, produce)
+    if wait and not path.exists():
+        writer.flush()                      # it may be queued from an earlier call
+        if not path.exists():
+            writer.write_now(path, produce)
+    return str(path)
+
+def put_bytes(data, ext=".jpg", wait=False):
+    """
+    Store encoded image bytes as-is and return the blob path. Identical pictures
+    are written once, however many records point at them. The write happens in
+    the background unless `wait` is set; then the blob is on disk on return, or
+    OSError is raised.
+    """
+    return _put(content_digest(data), ext, lambda: data, wait=wait)
+
+def encode_image(img):
+    """JPEG bytes for an OpenCV (BGR) array or a PIL image."""
+    if isinstance(img, np.ndarray):
+        import cv2
+        ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        if not ok:
+            raise ValueError("Could not encode image")
+        return buf.tobytes()
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    buf = BytesIO()
+    img.save(buf, format="JPEG", quality=JPEG_QUALITY)
+    return buf.getvalue()
+
+def put_file(path):
+    """
+    Store an existing image file as-is (no re-encode). Only its hash is read
+    here; the copy is queued like any other capture.
+    """
+    path = Path(path)
+    return _put(file_digest(path), path.suffix.lower() or ".jpg", path.read_bytes)
+
+def put_image(img):
+    """
+    Store a capture and return its blob path. Accepts OpenCV arrays, PIL images,
+    encoded bytes or a file path (blob paths are returned unchanged).
+
+    Only the hash runs here; JPEG encoding and the write happen on the writer
+    thread.
+    """
+    if isinstance(img, (str, Path)):
+        return str(img) if is_blob(img) else put_file(img)
+    if isinstance(img, (bytes, bytearray)):
+        return put_bytes(bytes(img))
+    img = img.copy()                        # the caller may reuse its frame buffer
+    return _put(_pixel_digest(_rgb(img)), ".jpg", lambda: encode_image(img))
+
+# ----------------------------
+# References / GC
+# ----------------------------
+def _record_paths(record):
+    for field in ("image", "file"):
+        if isinstance(record.get(field), str):
+            yield record[field]
+    for path in record.get("images") or []:
+        if isinstance(path, str):
+            yield path
+
+def referenced(store=None):
+    """Resolved paths of every image referenced by a history record."""
+    store = store or get_store()
+    return {
+        str(Path(p).resolve())
+        for tab in TABS for record in store.records(tab) for p in _record_paths(record)
+    }
+
+def gc(store=None, dry_run=False, grace_seconds=GC_GRACE_SECONDS):
+    """Delete blobs no history record references. Returns (files, bytes) removed."""
+    keep = referenced(store)
+    cutoff = time.time() - grace_seconds
+    removed = freed = 0
+    for blob in BLOB_DIR.rglob("*"):
+        if not blob.is_file() or str(blob.resolve()) in keep:
+            continue
+        stat = blob.stat()
+        if stat.st_mtime > cutoff:
+            continue
+        removed += 1
+        freed += stat.st_size
+        if not dry_run:
+            blob.unlink()
+    return removed, freed
+
+# ----------------------------
+# Migration of the old folders
+# ----------------------------
+def migrate(store=None, dry_run=False):
+    """
+    Move every image in LEGACY_DIRS into the blob store (duplicates collapse to
+    one blob) and point history records at the blobs. An original is only
+    deleted once its blob is on disk; files that can't be stored stay where they
+    are (counted in "failed"). Safe to run again.
+    """
+    store = store or get_store()
+    by_path, by_name, seen = {}, {}, {}     # seen: digest -> blob path
+    stats = {"files": 0, "duplicates": 0, "bytes_saved": 0, "records_updated": 0, "failed": 0}
+
+    for folder in LEGACY_DIRS:
+        if not folder.exists():
+            continue
+        for f in sorted(folder.rglob("*")):
+            if not f.is_file() or f.suffix.lower() not in IMAGE_EXTS:
+                continue
+            data = f.read_bytes()
+            digest = content_digest(data)
+            target = seen.get(digest) or _existing(digest, get_writer()) or blob_path(digest, f.suffix.lower())
+            duplicate = digest in seen or target.exists()
+            if not dry_run:
+                try:
+                    target = Path(put_bytes(data, f.suffix.lower(), wait=True))
+                except OSError as e:
+                    print(f"❌ Could not migrate {f}: {e}")
+                    stats["failed"] += 1
+                    continue
+                if not target.is_file() or target.stat().st_size == 0:
+                    stats["failed"] += 1
+                    continue
+                f.unlink()                  # only once its blob is on disk
+            stats["files"] += 1
+            if duplicate:
+                stats["duplicates"] += 1
+                stats["bytes_saved"] += len(data)
+            seen[digest] = target
+            by_path[str(f.resolve())] = str(target)
+            by_name.setdefault(f.name, str(target))
+
+    def _lookup(path, by_filename=True):
+        new = by_path.get(str(Path(path).resolve()))
+        if new is None and by_filename:
+            # same fallback as history._load_image; old records may hold Windows paths
+            new = by_name.get(PureWindowsPath(path).name)
+        return new
+
+    for tab in TABS:
+        for record in store.records(tab):
+            changed = False
+            if isinstance(record.get("image"), str) and _lookup(record["image"]):
+                record["image"] = _lookup(record["image"])
+                changed = True
+            # `file` is the original upload name on some pages; only rewrite real paths
+            if isinstance(record.get("file"), str) and _lookup(record["file"], by_filename=False):
+                record["file"] = _lookup(record["file"], by_filename=False)
+                changed = True
+            if record.get("images"):
+                images = [_lookup(p) or p if isinstance(p, str) else p for p in record["images"]]
+                if images != record["images"]:
+                    record["images"] = images
+                    changed = True
+            if changed:
+                stats["records_updated"] += 1
+                if not dry_run:
+                    store.update(record["id"], record)
+
+    if not dry_run:
+        for folder in LEGACY_DIRS:
+            if not folder.exists():
+                continue
+            for d in sorted((p for p in folder.rglob("*") if p.is_dir()), reverse=True) + [folder]:
+                if not any(d.iterdir()):
+                    d.rmdir()
+    return stats
+
+# ----------------------------
+# CLI
+# ----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the content-addressed capture store.")
+    parser.add_argument("command", choices=["migrate", "gc"])
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    parser.add_argument("--grace", type=float, default=GC_GRACE_SECONDS,
+                        help="gc: keep unreferenced blobs younger than this many seconds")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        stats = migrate(dry_run=args.dry_run)
+        print(f"✅ {stats['files']} files -> blobs ({stats['duplicates']} duplicates, "
+              f"{stats['bytes_saved'] / 1024:.0f} KiB saved), {stats['records_updated']} history records updated")
+        if stats["failed"]:
+            print(f"⚠️ {stats['failed']} files could not be stored and were left in place")
+    else:
+        removed, freed = gc(dry_run=args.dry_run, grace_seconds=args.grace)
+        print(f"✅ Removed {removed} unreferenced blobs ({freed / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
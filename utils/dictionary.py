@@ -0,0 +1,276 @@
+import time
+import sqlite3
+import argparse
+import threading
+
+from pathlib import Path
+
+from src.cache import LRUCache
+from src.config import (
+    DICTIONARY_SOURCE, DICTIONARY_WORDS, DICTIONARY_INDEX, DICTIONARY_URL,
+    DICTIONARY_TIMEOUT, DICTIONARY_RETRY_AFTER, DICTIONARY_TTL, DICTIONARY_MISS_TTL
+)
+
+NOT_FOUND = "No valid meaning found (possibly gibberish)."
+LOOKUP_ERROR = "⚠️ Error while fetching meaning."
+
+class LookupFailed(Exception):
+    """A source could not answer (network down, bad response), as opposed to "no such word"."""
+
+def _connect(path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+# ----------------------------
+# Sources
+# ----------------------------
+# A source has `lookup(word) -> definition | None` (None = not a word it knows)
+# and raises LookupFailed when it cannot tell.
+
+class LocalSource:
+    """
+    Offline dictionary: a word list indexed into SQLite. Lines are
+    `word<TAB>definition`; a bare `word` is known but has no definition. `#`
+    starts a comment.
+
+    The index remembers which list it was built from and re-indexes only when
+    that same file changes. Without `words_path` the recorded list is used (the
+    bundled DICTIONARY_WORDS for a new index), so a list indexed with
+    `python -m utils.dictionary build <file>` survives app restarts.
+    """
+    name = "local"
+
+    def __init__(self, words_path=None, index_path=DICTIONARY_INDEX):
+        self.index_path = Path(index_path)
+        self._conn = _connect(self.index_path)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS words (word TEXT PRIMARY KEY, definition TEXT) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+        if words_path is None:
+            words_path = self._meta("words_source") or DICTIONARY_WORDS
+        self.words_path = Path(words_path)
+        self._ensure_index()
+
+    def _meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _ensure_index(self):
+        if not self.words_path.exists():
+            return
+        source = str(self.words_path.resolve())
+        version = str(self.words_path.stat().st_mtime_ns)
+        if self._meta("words_source") == source and self._meta("words_version") == version:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM words")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO words (word, definition) VALUES (?, ?)", _read_word_list(self.words_path)
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("words_source", source), ("words_version", version)],
+            )
+
+    def lookup(self, word):
+        with self._lock:
+            row = self._conn.execute("SELECT definition FROM words WHERE word = ?", (word,)).fetchone()
+        return row[0] if row and row[0] else None
+
+    def __contains__(self, word):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM words WHERE word = ?", (word,)).fetchone() is not None
+
+    def words(self):
+        """All known words (with or without a definition)."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT word FROM words ORDER BY word")]
+
+def _read_word_list(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            word, _, definition = line.partition("\t")
+            yield word.strip().lower(), definition.strip() or None
+
+class RemoteSource:
+    """
+    Free Dictionary API (dictionaryapi.dev). After a network failure the source
+    fails fast for `retry_after` seconds, so offline machines pay the timeout once.
+    """
+    name = "remote"
+
+    def __init__(self, url=DICTIONARY_URL, timeout=DICTIONARY_TIMEOUT, retry_after=DICTIONARY_RETRY_AFTER):
+        self.url = url
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._down_until = 0.0
+
+    def lookup(self, word):
+        import requests
+        if time.time() < self._down_until:
+            raise LookupFailed("remote dictionary unavailable")
+        try:
+            response = requests.get(self.url.format(word=word), timeout=self.timeout)
+        except requests.RequestException as e:
+            self._down_until = time.time() + self.retry_after
+            raise LookupFailed(str(e)) from e
+        if response.status_code == 404:
+            return None
+        try:
+            data = response.json()
+            return data[0]["meanings"][0]["definitions"][0]["definition"]
+        except (ValueError, LookupError, TypeError) as e:
+            raise LookupFailed(f"unexpected response ({response.status_code})") from e
+
+class StubSource:
+    """Fixed word -> definition mapping; for tests and machines without any word list."""
+    name = "stub"
+
+    def __init__(self, entries=None):
+        self.entries = {k.lower(): v for k, v in (entries or {}).items()}
+
+    def lookup(self, word):
+        return self.entries.get(word)
+
+class CachedSource:
+    """
+    Persistent TTL cache in front of a (slow) source, stored next to the local
+    index. Definitions are kept for `ttl` seconds, "no such word" answers for
+    `miss_ttl`; failures are never cached.
+    """
+    def __init__(self, source, index_path=DICTIONARY_INDEX, ttl=DICTIONARY_TTL, miss_ttl=DICTIONARY_MISS_TTL):
+        self.source = source
+        self.name = f"cached-{source.name}"
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self._conn = _connect(index_path)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lookup_cache (
+                    source TEXT, word TEXT, definition TEXT, expires REAL,
+                    PRIMARY KEY (source, word)
+                )
+            """)
+
+    def lookup(self, word):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT definition, expires FROM lookup_cache WHERE source = ? AND word = ?",
+                (self.source.name, word),
+            ).fetchone()
+        if row and row[1] > now:
+            return row[0]
+
+        definition = self.source.lookup(word)
+        expires = now + (self.ttl if definition is not None else self.miss_ttl)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookup_cache (source, word, definition, expires) VALUES (?, ?, ?, ?)",
+                (self.source.name, word, definition, expires),
+            )
+        return definition
+
+class ChainSource:
+    """
+    First definition from `sources` in order. None if every source says the word
+    is unknown; LookupFailed if none had it and at least one could not answer.
+    """
+    name = "chain"
+
+    def __init__(self, sources):
+        self.sources = sources
+
+    def lookup(self, word):
+        failure = None
+        for source in self.sources:
+            try:
+                definition = source.lookup(word)
+            except LookupFailed as e:
+                failure = e
+                continue
+            if definition is not None:
+                return definition
+        if failure is not None:
+            raise failure
+        return None
+
+def build_source(name=DICTIONARY_SOURCE):
+    if name == "local":
+        return LocalSource()
+    if name == "remote":
+        return CachedSource(RemoteSource())
+    if name == "stub":
+        return StubSource()
+    if name == "auto":
+        return ChainSource([LocalSource(), CachedSource(RemoteSource())])
+    raise ValueError(f"Unknown DICTIONARY_SOURCE: {name!r} (expected auto, local, remote or stub)")
+
+# ----------------------------
+# Dictionary
+# ----------------------------
+class Dictionary:
+    """In-process LRU over a source, returning display strings for Word Maker."""
+    def __init__(self, source, maxsize=1024):
+        self.source = source
+        self.cache = LRUCache(maxsize)
+
+    def lookup(self, word):
+        word = word.strip().lower()
+        if not word:
+            return NOT_FOUND
+        meaning = self.cache.get(word)
+        if meaning is None:
+            try:
+                meaning = self.source.lookup(word) or NOT_FOUND
+            except LookupFailed:
+                return LOOKUP_ERROR
+            self.cache.put(word, meaning)
+        return meaning
+
+_DICTIONARY = None
+_DICTIONARY_LOCK = threading.Lock()
+
+def get_dictionary():
+    """Process-wide Dictionary for DICTIONARY_SOURCE."""
+    global _DICTIONARY
+    with _DICTIONARY_LOCK:
+        if _DICTIONARY is None:
+            _DICTIONARY = Dictionary(build_source())
+        return _DICTIONARY
+
+def lookup_word(word):
+    return get_dictionary().lookup(word)
+
+# ----------------------------
+# CLI
+# ----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Word Maker dictionary tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="(re)index a word list into the local dictionary; the app keeps using it")
+    p_build.add_argument("words", nargs="?", default=str(DICTIONARY_WORDS),
+                         help="word list (default: the bundled list, which also switches back to it)")
+    p_lookup = sub.add_parser("lookup", help="look a word up through the configured sources")
+    p_lookup.add_argument("word")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        source = LocalSource(words_path=args.words)
+        print(f"✅ Indexed {len(source.words())} words from {args.words} into {source.index_path}")
+    else:
+        print(lookup_word(args.word))
+
+if __name__ == "__main__":
+    main()
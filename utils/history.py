@@ -1,30 +1,29 @@
 import streamlit as st
-import pandas as pd
 import json
+import math
 import base64
 from io import BytesIO
 from PIL import Image
 from pathlib import Path
 from datetime import datetime
-from fpdf import FPDF
-from pathlib import Path
-import cv2
+from utils.startup import lazy_import
+from utils.history_store import get_store, LEGACY_HISTORY_FILE, projection
+from utils.thumbnails import thumbnail, thumbnails
+from utils.reports import get_report
+from utils.capture_store import put_image, flush as flush_captures
 
 # ----------------------------
 # Pathing
 # ----------------------------
 
-HISTORY_FILE = Path("history.json")
-CAPTURE_FOLDERS = {
+HISTORY_FILE = LEGACY_HISTORY_FILE     # imported once into history.db, see utils/history_store.py
+CAPTURE_FOLDERS = {                     # pre-blob-store folders, see utils/capture_store.py
     "upload": Path("captures/upload"),
     "live": Path("captures/live"),
     "word": Path("captures/word_maker"),
     "quiz": Path("captures/quiz")
 }
 
-QUIZ_DIR = Path("captures/quiz")
-QUIZ_DIR.mkdir(parents=True, exist_ok=True)
-
 # ----------------------------
 # Loading Image
 # ----------------------------
@@ -43,122 +42,38 @@ def _load_image(img_path, tab=None):
 # Initialize history
 # -------------------------
 def _init_history():
-    """Load history from file if exists, else initialize empty dict with all tabs."""
+    """Open the history store (importing the legacy history.json on first run)."""
     with st.spinner("📂 Loading history..."):
-        if "history" not in st.session_state or not isinstance(st.session_state.history, dict):
-            HISTORY_FILE = Path("history.json")
-            if HISTORY_FILE.exists():
-                try:
-                    with open(HISTORY_FILE, "r") as f:
-                        st.session_state.history = json.load(f)
-                    if "quiz" not in st.session_state.history:
-                        st.session_state.history["quiz"] = []
-                except Exception:
-                    st.session_state.history = {"upload": [], "live": [], "word": [], "quiz": []}
-            else:
-                st.session_state.history = {"upload": [], "live": [], "word": [], "quiz": []}
-
-_init_history()
+        return get_store()
 
 # -------------------------
 # PDF download helper
 # -------------------------
-def download_pdf(records, base_filename):
-    with st.spinner("📝 Generating PDF..."):
-        pdf = FPDF()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 16)
-        pdf.cell(0, 10, "ASL Upload Prediction History", ln=True, align="C")
-        pdf.ln(5)
-
-        for idx, record in enumerate(records, start=1):
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(0, 8, f"Record {idx}", ln=True)
-            pdf.set_font("Arial", "", 12)
-
-            # File Name
-            pdf.cell(0, 7, f"File Name: {record.get('file','-')}", ln=True)
-            # Timestamp
-            pdf.cell(0, 7, f"Timestamp: {record.get('timestamp','-')}", ln=True)
-
-            # Image
-            if "image" in record and record["image"]:
-                img_path = record["image"]
-                if Path(img_path).exists():
-                    try:
-                        pdf.image(str(img_path), w=100)
-                    except Exception:
-                        pdf.cell(0, 7, "<Image could not be rendered>", ln=True)
-                else:
-                    pdf.cell(0, 7, "<Image not found>", ln=True)
-
-            # Prediction & Confidence
-            pdf.cell(0, 7, f"Prediction: {record.get('prediction','-')}", ln=True)
-            pdf.cell(0, 7, f"Confidence: {record.get('confidence',0):.2%}", ln=True)
-
-            # Predictions
-            if "top5" in record:
-                pdf.set_font("Arial", "B", 12)
-                pdf.cell(0, 7, "Top-5 Predictions:", ln=True)
-                pdf.set_font("Arial", "", 11)
-                for feat in record["top5"]:
-                    lbl = str(feat.get("label","-")).replace("—","-")
-                    conf = feat.get("confidence",0)
-                    pdf.cell(0, 6, f"  {lbl} - {conf:.2%}", ln=True)
-
-            pdf.ln(5) 
-
-        pdf_output = BytesIO()
-        pdf.output(pdf_output)
-        pdf_output.seek(0)
-
+def download_pdf(records, tab, base_filename):
+    """
+    PDF download for the selected records. The report is built in the background
+    (see utils/reports.py) and cached per selection, so reruns don't rebuild it.
+    """
+    job = get_report(tab, records, resolve=_load_image)
+    if not job.done:
+        @st.fragment(run_every=0.5)
+        def _progress():
+            if job.done:
+                st.rerun()
+            st.progress(job.progress, text=f"📝 {job.stage}... ({job.steps}/{job.total})")
+        _progress()
+        return
+
+    if job.error is not None:
+        st.error(f"❌ PDF generation failed: {job.error}")
+        return
     st.success("✅ PDF ready for download!")
     st.download_button(
-        label="⬇️ Download PDF",
-        data=pdf_output,
+        label="⬇️ Download Word Maker PDF" if tab == "word" else "⬇️ Download PDF",
+        data=job.path.read_bytes(),
         file_name=f"{base_filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-        mime="application/pdf"
-    )
-
-# -------------------------
-# PDF generation
-# -------------------------
-def download_word_pdf(records, base_filename="word_history"):
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 10, "ASL Word Maker History", ln=True, align="C")
-    pdf.ln(5)
-
-    for idx, record in enumerate(records, start=1):
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 8, f"Record {idx}", ln=True)
-        pdf.set_font("Arial", "", 12)
-
-        pdf.cell(0, 7, f"Word: {record.get('word','-')}", ln=True)
-        pdf.cell(0, 7, f"Meaning: {record.get('meaning','-')}", ln=True)
-        pdf.cell(0, 7, f"No. of Letters: {len(record.get('letters',[]))}", ln=True)
-
-        for i, img_path in enumerate(record.get("images", []), start=1):
-            pdf.cell(0, 7, f"Letter {i}: {record['letters'][i-1]}", ln=True)
-            try:
-                pdf.image(img_path, w=50)
-            except Exception:
-                pdf.cell(0, 7, "<Image could not be rendered>", ln=True)
-
-        pdf.ln(5)
-
-    pdf_output = BytesIO()
-    pdf.output(pdf_output)
-    pdf_output.seek(0)
-
-    st.download_button(
-        label="⬇️ Download Word Maker PDF",
-        data=pdf_output,
-        file_name=f"{base_filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-        mime="application/pdf"
+        mime="application/pdf",
+        key=f"download_pdf_{tab}"
     )
 
 # -------------------------
@@ -191,11 +106,11 @@ def preview_word_maker_records(records, selected_indices):
         # Display letters with their images
         letters = record.get("letters", [])
         images = record.get("images", [])
-        for i, (letter, img_path) in enumerate(zip(letters, images), start=1):
+        thumbs = thumbnails([_load_image(p, tab="word") for p in images], 300)
+        for i, (letter, img_path, thumb) in enumerate(zip(letters, images, thumbs), start=1):
             st.markdown(f"**Letter {i}: {letter}**")
-            img_file = _load_image(img_path, tab="word")
-            if img_file:
-                st.image(img_file, width=150)
+            if thumb:
+                st.image(thumb, width=150)
             else:
                 st.warning(f"⚠️ Image {img_path} not found.")
         
@@ -210,49 +125,32 @@ def preview_word_maker_records(records, selected_indices):
 # Save record to history
 # -------------------------
 def save_to_history(tab: str, record: dict):
-    """Save a record to session_state and persist to disk, adding timestamp."""
+    """Append a record to the history store, adding timestamp."""
     with st.spinner("💾 Saving record to history..."):
-        _init_history()
-        if tab not in st.session_state.history:
-            st.session_state.history[tab] = []
+        store = _init_history()
 
         # Add timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         record["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # Save image(s) as .jpg
+        # Image(s) go to the content-addressed capture store; the record keeps the
+        # blob path, so saving the same picture again doesn't copy it again
         if "image" in record and record["image"] is not None:
-            img_path = record["image"]
-            img_filename = QUIZ_DIR / f"quiz_{timestamp}.jpg"
-            
-            # Load image from dataset folder if it's a path
-            img = Image.open(img_path) if isinstance(img_path, (str, Path)) else img_path
-            
-            # Save to quiz folder
-            img.save(img_filename)
-            record["image"] = str(img_filename)
+            record["image"] = put_image(record["image"])
 
         # For Word Maker: multiple letter images
         if tab == "word" and "images" in record:
-            word_dir = CAPTURE_FOLDERS["word"] / timestamp
-            word_dir.mkdir(parents=True, exist_ok=True)
-            new_image_paths = []
-            for i, img in enumerate(record["images"], start=1):
-                img_path = word_dir / f"{i}_{record['letters'][i-1]['label']}_{timestamp}.jpg"
-                if hasattr(img, "shape"):
-                    cv2.imwrite(str(img_path), img)
-                elif isinstance(img, Image.Image):
-                    img.save(img_path)
-                new_image_paths.append(img_path)
-            record["images"] = [str(p) for p in new_image_paths]
+            record["images"] = [put_image(img) for img in record["images"] if img is not None]
 
-        st.session_state.history[tab].append(record)
-
-        # Persist to JSON
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(st.session_state.history, f, indent=2)
+        record["id"] = store.append(tab, record)
     
     st.success("✅ Record saved to History")
+    return record["id"]
+
+def update_history(record_id: int, record: dict):
+    """Replace an already saved record, e.g. after the user edited it."""
+    with st.spinner("💾 Updating history record..."):
+        get_store().update(record_id, record)
+    st.success("✅ History record updated")
 
 # -------------------------
 # Download helper
@@ -263,11 +161,41 @@ def download_file(data, base_filename, fmt):
     mime = "text/csv" if fmt == "csv" else "application/json"
     st.download_button(label=f"⬇️ Download {fmt.upper()}", data=data, file_name=filename, mime=mime)
 
+# -------------------------
+# Filters
+# -------------------------
+def _filter_controls(store, key):
+    """Date / prediction / confidence filters for one tab, as HistoryStore.query kwargs."""
+    with st.expander("🔎 Filters"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            dates = st.date_input("Date range", value=[], key=f"filter_dates_{key}")
+        with col2:
+            predictions = st.multiselect(
+                "Word" if key == "word" else "Prediction",
+                options=store.distinct_predictions(key),
+                key=f"filter_pred_{key}"
+            )
+        with col3:
+            min_confidence = 0.0
+            if key != "word":
+                min_confidence = st.slider("Min. confidence", 0.0, 1.0, 0.0, 0.05, key=f"filter_conf_{key}")
+
+    dates = list(dates) if isinstance(dates, (list, tuple)) else [dates]
+    return {
+        "date_from": dates[0].isoformat() if len(dates) > 0 else None,
+        "date_to": dates[-1].isoformat() if len(dates) > 0 else None,
+        "predictions": predictions,
+        "min_confidence": min_confidence,
+    }
+
 # -------------------------
 # Show history
 # -------------------------
 def show():
-    _init_history()
+    pd = lazy_import("pandas")
+    store = _init_history()
+    flush_captures(timeout=2.0)             # so previews of just-saved captures find their files
     
     st.sidebar.success("🤟 To Check your activities or Download them Select Different Tabs.")
     
@@ -278,36 +206,48 @@ def show():
 
     for i, key in enumerate(tab_keys):
         with tabs[i]:
-            records = st.session_state.history.get(key, [])
-            if not records:
+            if not store.count(key):
                 st.info(f"No {key} history yet.")
                 continue
-            
-            def safe_val(val):
-                if isinstance(val, list) or isinstance(val, dict):
-                    return str(val)
-                return val
 
-            df = pd.DataFrame([
-                {k: ("<Image>" if k == "image" else safe_val(v)) for k, v in r.items() if k not in ("top5",)}
-                for r in records
-            ])
-            st.dataframe(df, use_container_width=True)
+            filters = _filter_controls(store, key)
+            matched = store.count(key, **filters)
+            if not matched:
+                st.info("No records match the selected filters.")
+                continue
+
+            col1, col2 = st.columns(2)
+            with col1:
+                page_size = st.selectbox("Rows per page", [10, 25, 50, 100], key=f"page_size_{key}")
+            total_pages = math.ceil(matched / page_size)
+            with col2:
+                page_num = st.number_input(
+                    f"Page (1-{total_pages})", min_value=1, max_value=total_pages, step=1, key=f"page_{key}"
+                )
+
+            # Only this page's rows, and only the tab's columns
+            rows = store.query(key, limit=page_size, offset=(page_num - 1) * page_size, **filters)
+            df = pd.DataFrame.from_records(rows, columns=projection(key))
+            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.caption(f"Showing {len(rows)} of {matched} records · page {page_num} of {total_pages}")
+
+            page_ids = [row[0] for row in rows]
+            timestamps = {row[0]: row[1] for row in rows}
 
-            select_all = st.checkbox("Select All Records", key=f"select_all_{key}")
+            select_all = st.checkbox("Select All Records on this page", key=f"select_all_{key}")
 
-            selected_indices = []
+            selected_ids = []
             if select_all:
-                selected_indices = list(range(len(records)))
+                selected_ids = page_ids
             else:
-                selected_indices = st.multiselect(
+                selected_ids = st.multiselect(
                     "Select records to preview/download:",
-                    options=list(range(len(records))),
-                    format_func=lambda x: f"{x+1}: {records[x].get('timestamp','No Timestamp')}",
-                    key=f"select_records_{key}"
+                    options=page_ids,
+                    format_func=lambda x: f"{x}: {timestamps.get(x) or 'No Timestamp'}",
+                    key=f"select_records_{key}_{page_num}"
                 )
             
-            if selected_indices:
+            if selected_ids:
                 st.markdown("### 💾 Download Options")
                 chosen_formats = st.multiselect(
                     "Select format(s) to download:",
@@ -316,26 +256,21 @@ def show():
                     key=f"download_formats_{key}"
                 )
                 with st.spinner("🔍 Preparing preview..."):
-                    selected_records = [records[i] for i in selected_indices]
+                    selected_records = store.fetch(selected_ids)
                     for fmt in chosen_formats:
                         if fmt == "CSV":
                             download_file(pd.DataFrame(selected_records).to_csv(index=False), f"{key}_history", "csv")
                         elif fmt == "JSON":
                             download_file(json.dumps(selected_records, indent=2), f"{key}_history", "json")
                         elif fmt == "PDF":
-                            if key == "word":
-                                download_word_pdf(selected_records)
-                            else:
-                                download_pdf(selected_records, f"{key}_history")
+                            download_pdf(selected_records, key, f"{key}_history")
                 
                     st.markdown("---")
                     
                     st.markdown("### 📄 Preview Selected Records")
-                    for idx in selected_indices:
-                        record = records[idx]
-                        
+                    for record in selected_records:
                         if key == "word":
-                            st.markdown(f"**Record {idx+1}**")
+                            st.markdown(f"**Record {record['id']}**")
                             st.write(f"**Word:** {record.get('word','-')}")
                             st.write(f"**Meaning:** {record.get('meaning','-')}")
                             st.write(f"**File Name:** {record.get('file','-')}")
@@ -346,17 +281,17 @@ def show():
                             if letters and images:
                                 st.write("#### Letters & Images")
                                 cols = st.columns(len(letters))
-                                for i, (letter, img_path) in enumerate(zip(letters, images)):
+                                thumbs = thumbnails([_load_image(p, tab="word") for p in images], 320)
+                                for i, (letter, img_path, thumb) in enumerate(zip(letters, images, thumbs)):
                                     with cols[i]:
                                         st.write(f"Letter: {letter['label']}")
-                                        img_file = _load_image(img_path, tab="word")
-                                        if img_file:
-                                            st.image(img_file, use_container_width=True)
+                                        if thumb:
+                                            st.image(thumb, use_container_width=True)
                                         else:
                                             st.warning(f"⚠️ Image not found: {img_path}")
                             st.divider()
                         else:
-                            st.markdown(f"**Record {idx+1}**")
+                            st.markdown(f"**Record {record['id']}**")
                             st.write(f"**File:** {record.get('file','-')}")
                             st.write(f"**Prediction:** {record.get('prediction','-')}")
                             st.write(f"**Confidence:** {record.get('confidence',0):.2%}")
@@ -371,7 +306,7 @@ def show():
                             if "image" in record and record["image"]:
                                 img_path = record["image"]
                                 if Path(img_path).exists():
-                                    st.image(img_path)
+                                    st.image(thumbnail(img_path, 480))
                                 else:
                                     try:
                                         img_data = base64.b64decode(img_path)
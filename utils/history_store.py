@@ -0,0 +1,211 @@
+import json
+import sqlite3
+import threading
+
+from pathlib import Path
+
+# ----------------------------
+# Pathing
+# ----------------------------
+HISTORY_DB = Path("history.db")
+LEGACY_HISTORY_FILE = Path("history.json")
+TABS = ("upload", "live", "word", "quiz")
+PROJECTION = ("id", "timestamp", "prediction", "confidence", "file")   # indexed columns
+
+# Word Maker letters as one string ("CAB"); legacy records store bare labels
+_LETTERS = (
+    "(SELECT group_concat(CASE type WHEN 'object' THEN json_extract(value, '$.label') ELSE value END, '')"
+    " FROM json_each(data, '$.letters'))"
+)
+FIELDS = {                              # table column -> SQL; non-indexed fields are read from the stored JSON
+    **{column: column for column in PROJECTION},
+    "word": "prediction",
+    "meaning": "json_extract(data, '$.meaning')",
+    "letters": _LETTERS,
+}
+TAB_PROJECTIONS = {                     # columns shown in each History tab's table
+    "upload": PROJECTION,
+    "live": PROJECTION,
+    "word": ("id", "timestamp", "word", "letters", "meaning", "file"),
+}
+
+def projection(tab):
+    return TAB_PROJECTIONS.get(tab, PROJECTION)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    tab         TEXT NOT NULL,
+    timestamp   TEXT,
+    prediction  TEXT,
+    confidence  REAL,
+    file        TEXT,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_tab_time ON records (tab, timestamp);
+CREATE INDEX IF NOT EXISTS idx_records_tab_pred ON records (tab, prediction);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def _columns(record):
+    """Values for the indexed columns; the full record is kept as JSON in `data`."""
+    prediction = record.get("prediction", record.get("word"))
+    confidence = record.get("confidence")
+    return (
+        record.get("timestamp"),
+        None if prediction is None else str(prediction),
+        float(confidence) if isinstance(confidence, (int, float)) else None,
+        None if record.get("file") is None else str(record.get("file")),
+    )
+
+# ----------------------------
+# History Store
+# ----------------------------
+class HistoryStore:
+    """
+    SQLite history (WAL mode): O(1) appends, indexed by tab and timestamp, and
+    safe with several sessions/processes writing at once. Each thread gets its
+    own connection. On first open, records from the old history.json are
+    imported once.
+    """
+    def __init__(self, path=HISTORY_DB, legacy_json=LEGACY_HISTORY_FILE):
+        self.path = Path(path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+        self._migrate_json()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _migrate_json(self):
+        """One-shot import of the legacy history.json (tracked in the meta table)."""
+        if self.legacy_json is None or not self.legacy_json.exists():
+            return
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute("SELECT value FROM meta WHERE key = 'migrated_json'").fetchone()
+            if done:
+                return
+            try:
+                with open(self.legacy_json, "r") as f:
+                    legacy = json.load(f)
+            except (OSError, ValueError):
+                legacy = {}
+            rows = [
+                (tab, *_columns(record), json.dumps(record))
+                for tab, records in legacy.items() if isinstance(records, list)
+                for record in records if isinstance(record, dict)
+            ]
+            conn.executemany(
+                "INSERT INTO records (tab, timestamp, prediction, confidence, file, data) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_json', ?)", (str(len(rows)),))
+
+    def append(self, tab, record):
+        """Insert one record; returns its id."""
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO records (tab, timestamp, prediction, confidence, file, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (tab, *_columns(record), json.dumps(record)),
+            )
+        return cur.lastrowid
+
+    def update(self, record_id, record):
+        """Replace a stored record (and its indexed columns) in place."""
+        record = {k: v for k, v in record.items() if k != "id"}
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "UPDATE records SET timestamp = ?, prediction = ?, confidence = ?, file = ?, data = ? WHERE id = ?",
+                (*_columns(record), json.dumps(record), record_id),
+            )
+
+    def records(self, tab):
+        """All records of a tab in insertion order, each with its `id`."""
+        rows = self._conn().execute(
+            "SELECT id, data FROM records WHERE tab = ? ORDER BY id", (tab,)
+        ).fetchall()
+        return [{**json.loads(row["data"]), "id": row["id"]} for row in rows]
+
+    @staticmethod
+    def _where(tab, date_from=None, date_to=None, predictions=None, min_confidence=None):
+        """
+        WHERE clause for the filters. Dates are "YYYY-MM-DD" strings (inclusive),
+        compared against the "YYYY-MM-DD HH:MM:SS" timestamps.
+        """
+        clauses, params = ["tab = ?"], [tab]
+        if date_from:
+            clauses.append("timestamp >= ?")
+            params.append(f"{date_from} 00:00:00")
+        if date_to:
+            clauses.append("timestamp <= ?")
+            params.append(f"{date_to} 23:59:59")
+        if predictions:
+            clauses.append(f"prediction IN ({', '.join('?' * len(predictions))})")
+            params.extend(predictions)
+        if min_confidence:
+            clauses.append("confidence >= ?")
+            params.append(float(min_confidence))
+        return " AND ".join(clauses), params
+
+    def count(self, tab, **filters):
+        where, params = self._where(tab, **filters)
+        return self._conn().execute(f"SELECT COUNT(*) FROM records WHERE {where}", params).fetchone()[0]
+
+    def query(self, tab, columns=None, limit=None, offset=0, **filters):
+        """
+        One page of rows (newest first) as tuples of `columns` (default: the
+        tab's projection), extracted in SQL without decoding records in Python.
+        """
+        columns = columns or projection(tab)
+        unknown = set(columns) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown history columns: {sorted(unknown)}")
+        where, params = self._where(tab, **filters)
+        select = ", ".join(f"{FIELDS[c]} AS {c}" for c in columns)
+        sql = f"SELECT {select} FROM records WHERE {where} ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        return [tuple(row) for row in self._conn().execute(sql, params).fetchall()]
+
+    def fetch(self, ids):
+        """Full records for the given ids, in the same order."""
+        ids = list(ids)
+        if not ids:
+            return []
+        rows = self._conn().execute(
+            f"SELECT id, data FROM records WHERE id IN ({', '.join('?' * len(ids))})", ids
+        ).fetchall()
+        by_id = {row["id"]: {**json.loads(row["data"]), "id": row["id"]} for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def distinct_predictions(self, tab):
+        rows = self._conn().execute(
+            "SELECT DISTINCT prediction FROM records WHERE tab = ? AND prediction IS NOT NULL ORDER BY prediction",
+            (tab,),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+def get_store():
+    """Process-wide HistoryStore, opened (and migrated) on first use."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = HistoryStore()
+        return _STORE
@@ -1,4 +1,3 @@
-import os
 import cv2
 import time
 import numpy as np
@@ -7,60 +6,68 @@ import streamlit as st
 
 from PIL import Image
 from pathlib import Path
-from datetime import datetime
 from streamlit_webrtc import webrtc_streamer, VideoProcessorBase
+from src.batching import shared_scheduler
+from src.config import FRAME_GATING, HAND_CROP
+from src.gating import FrameGate, gate_frame
+from src.hand_crop import HandTracker
+from src.preprocess import Preprocessor, preprocess
+from src.smoothing import StreamDecoder
+from src.workers import InferenceWorker
+from utils.capture_store import put_image
 from utils.history import save_to_history
 
-# ---------------------------
-# --- Pathing and Loading ---
-# ---------------------------
-CAPTURE_DIR = Path("captures/live")
-CAPTURE_DIR.mkdir(parents=True, exist_ok=True)
-os.makedirs(CAPTURE_DIR, exist_ok=True)
-
 class ASLProcessor(VideoProcessorBase):
     """
     Video processor for Streamlit WebRTC.
     Handles live ASL predictions.
     """
-    def __init__(self, clf, cooldown=2.0):
+    def __init__(self, clf, cooldown=0.0):
         self.clf = clf
         self.cooldown = cooldown
         self.last_prediction = None
         self.pred_label = "Waiting..."
         self.last_pred_time = 0
         self.last_frame = None
+        self.decoder = StreamDecoder(clf.class_names)
+        self.gate = FrameGate() if FRAME_GATING else None
+        self._nothing = _one_hot(clf.class_names, "nothing")
+        self.tracker = HandTracker() if HAND_CROP else None
+        self._pre = Preprocessor(crop=self.tracker.crop if self.tracker else None)
+        self.worker = InferenceWorker(
+            clf, self._preprocess,
+            scheduler=shared_scheduler(clf),
+            on_result=lambda frame, probs: self.decoder.update(probs, payload=frame),
+        )
 
     def recv(self, frame):
         """
-        Receive frame from WebRTC, run prediction every `cooldown` seconds,
-        overlay label, and return processed frame.
+        Receive frame from WebRTC, hand it to the inference worker (at most every
+        `cooldown` seconds, or slower while a letter is held), overlay the latest
+        smoothed label, and return right away.
         """
         img = frame.to_ndarray(format="bgr24")
         self.last_frame = img
         now = time.time()
 
-        if now - self.last_pred_time > self.cooldown:
-            try:
-                # Always pass raw frame to classifier
-                x = preprocess_frame(img)           
-                probs = self.clf.model.predict(x)[0]
-                idx = int(np.argmax(probs))
-                self.pred_label = self.clf.class_names[idx]
-                self.last_prediction = {
-                    "label": self.pred_label,
-                    "index": idx,
-                    "confidence": float(probs[idx]),
-                    "probs": {self.clf.class_names[i]: float(p) for i, p in enumerate(probs)}
-                }
-                self.last_pred_time = now
-            except Exception as e:
-                self.pred_label = f"Prediction failed: {e}"
-                self.last_prediction = None
+        if now - self.last_pred_time >= max(self.cooldown, self.decoder.sample_interval):
+            self.last_pred_time = now
+            gate_frame(self.gate, self.decoder, img, self.worker.submit, nothing=self._nothing)
+
+        if self.worker.error:
+            self.pred_label = f"Prediction failed: {self.worker.error}"
+            self.last_prediction = None
+        elif self.decoder.label is not None:
+            self.last_prediction = self.worker.latest
+            self.pred_label = self.decoder.label
 
+        # Draw on a copy: `last_frame` is captured/classified without the overlay
+        out = img.copy()
+        stable = self.decoder.stable_label
+        stats = self.worker.stats()
         cv2.putText(
-            img,
-            f"Prediction: {self.pred_label}",
+            out,
+            f"Prediction: {self.pred_label}" + (" (stable)" if stable else ""),
             (10, 40),
             cv2.FONT_HERSHEY_SIMPLEX,
             1,
@@ -68,39 +75,61 @@ class ASLProcessor(VideoProcessorBase):
             2,
             cv2.LINE_AA
         )
+        if self.gate:
+            gate = self.gate.stats()
+            stats["skipped"] = gate["skipped_static"] + gate["skipped_empty"]
+        cv2.putText(
+            out,
+            f"{stats['fps']:.1f} inf/s | dropped {stats['dropped']}"
+            + (f" | skipped {stats['skipped']}" if "skipped" in stats else ""),
+            (10, 70),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.5,
+            (0, 255, 0),
+            1,
+            cv2.LINE_AA
+        )
+
+        return av.VideoFrame.from_ndarray(out, format="bgr24")
+
+    def _preprocess(self, frame):
+        # Runs on the worker thread, one frame at a time, so the buffers and tracker need no lock
+        return self._pre.one(frame)
 
-        return av.VideoFrame.from_ndarray(img, format="bgr24")
+    def on_ended(self):
+        self.worker.stop()
+
+def _one_hot(class_names, label):
+    if label not in class_names:
+        return None
+    probs = np.zeros(len(class_names), dtype=np.float32)
+    probs[class_names.index(label)] = 1.0
+    return probs
 
 def preprocess_frame(frame):
     """
     frame: np.ndarray (BGR)
-    returns: np.ndarray, shape (1, 160, 160, 3), normalized
+    returns: np.ndarray, shape (1, 160, 160, 3), normalized like training (see src/preprocess.py)
     """
-    img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    img = cv2.resize(img, (160, 160)) 
-    img = img.astype(np.float32) / 255.0
-    return np.expand_dims(img, axis=0)
+    return preprocess(frame)
 
-def save_snapshot(clf, frame, top_k=5):
-    """
-    Save a snapshot and return top_k predictions.
-    """
-    img = frame if isinstance(frame, np.ndarray) else frame.to_ndarray(format="bgr24")
-    result = clf.predict(img)
-    probs = result["probs"]
-    results = sorted(probs.items(), key=lambda x: x[1], reverse=True)[:top_k]
-    return results
-
-def show_letter_capture(clf):
+def show_letter_capture(clf, auto_capture=False):
     """
     Opens a short camera session to capture a single ASL letter.
-    Returns (predicted_letter, frame) or (None, None) if failed.
+    With `auto_capture`, the first letter the stream decoder reports as stable
+    is taken without a button press.
+    Returns (predicted_letter, frame, probs) or (None, None, None) if failed;
+    `probs` is the full class probability vector behind the letter.
     """
-    st.info("📸 Position your hand for letter detection and click 'Capture Letter'")
+    if auto_capture:
+        st.info("📸 Position your hand and hold the sign steady until it is captured")
+    else:
+        st.info("📸 Position your hand for letter detection and click 'Capture Letter'")
 
     camera_container = st.empty()
     captured_letter = None
     frame = None
+    probs = None
 
     with camera_container:
         ctx = webrtc_streamer(
@@ -109,28 +138,44 @@ def show_letter_capture(clf):
             media_stream_constraints={"video": True, "audio": False},
         )
 
-    if ctx and ctx.video_processor and st.button("📸 Capture Letter"):
-        frame = ctx.video_processor.last_frame
+    processor = ctx.video_processor if ctx else None
+    if processor and auto_capture:
+        stable = st.session_state.pop("auto_captured_letter", None)
+        if stable:
+            captured_letter, frame, probs = stable
+        elif ctx.state.playing:
+            # Poll the decoder until a letter is held steady; only this fragment
+            # reruns meanwhile, the page reruns once a letter is found
+            @st.fragment(run_every=0.5)
+            def _poll_stable():
+                found = processor.decoder.pop_stable()
+                while found and found[0] == "nothing":
+                    found = processor.decoder.pop_stable()
+                if found:
+                    st.session_state.auto_captured_letter = found
+                    st.rerun()
+            _poll_stable()
+    elif processor and st.button("📸 Capture Letter"):
+        frame = processor.last_frame
         if frame is not None:
-            camera_container.empty()
+            result = clf.predict(frame)
+            captured_letter, probs = result.label, result.vector
+        else:
+            st.warning("⚠️ No frame captured yet.")
 
-            x = preprocess_frame(frame)
-            probs = clf.model.predict(x)[0]
-            idx = int(np.argmax(probs))
-            captured_letter = clf.class_names[idx]
+    if captured_letter is not None:
+        camera_container.empty()
 
-            col_img, col_info = st.columns([1, 2])
-            with col_img:
-                st.subheader("📷 Captured Image")
-                st.image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), use_container_width=True)
+        col_img, col_info = st.columns([1, 2])
+        with col_img:
+            st.subheader("📷 Captured Image")
+            st.image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), use_container_width=True)
 
-            with col_info:
-                st.subheader("🔮 Prediction Result")
-                st.success(f"Prediction: **{captured_letter}**")
-        else:
-            st.warning("⚠️ No frame captured yet.")
+        with col_info:
+            st.subheader("🔮 Prediction Result")
+            st.success(f"Prediction: **{captured_letter}**")
 
-    return captured_letter, frame
+    return captured_letter, frame, probs
 
 def _render_top_predictions(top5):
     st.subheader("📊 Top Predictions")
@@ -157,7 +202,7 @@ def show(clf):
         st.info("🎥 Start the camera and show your ASL gesture.")
         ctx = webrtc_streamer(
             key="asl-live",
-            video_processor_factory=lambda: ASLProcessor(clf, cooldown=1.5),
+            video_processor_factory=lambda: ASLProcessor(clf),
             media_stream_constraints={"video": True, "audio": False},
         )
         
@@ -167,19 +212,12 @@ def show(clf):
             frame = ctx.video_processor.last_frame
             if frame is not None:
                 with st.spinner("⚙️ Processing snapshot..."):
-                    img_filename = CAPTURE_DIR / f"asl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-                    cv2.imwrite(str(img_filename), frame)
-
-                    x = preprocess_frame(frame)
-                    probs = clf.model.predict(x, verbose=0)[0]
-                    pred_idx = int(np.argmax(probs))
-                    pred_label = clf.class_names[pred_idx]
-                    pred_conf = float(probs[pred_idx])
-
-                    top5 = sorted(
-                        [{"label": clf.class_names[i], "confidence": float(p)} for i, p in enumerate(probs)],
-                        key=lambda x: x["confidence"], reverse=True,
-                    )[:5]
+                    img_filename = Path(put_image(frame))
+
+                    result = clf.predict(frame)
+                    pred_label = result.label
+                    pred_conf = result.confidence
+                    top5 = result.top_k_dicts(5)
 
                     st.session_state.last_frame = frame
                     st.session_state.last_preds = (pred_label, pred_conf, top5, img_filename)
@@ -0,0 +1,234 @@
+import os
+import json
+import hashlib
+import threading
+
+from concurrent.futures import as_completed
+from pathlib import Path
+
+from src.cache import LRUCache
+from utils import capture_store
+from utils.startup import lazy_import
+from utils.thumbnails import ThumbnailCache
+
+# ----------------------------
+# Settings
+# ----------------------------
+REPORT_DIR = Path(".cache/reports")
+REPORT_IMAGE_DIR = Path(".cache/report_images")
+REPORT_IMAGE_MAX_BYTES = 128 * 1024 * 1024
+REPORT_MAX_FILES = 16                   # finished PDFs kept on disk / jobs kept in memory
+IMAGE_PX = 600                          # record image, printed 100 mm wide (~150 dpi)
+LETTER_PX = 300                         # word maker letter, printed 50 mm wide
+
+TITLES = {
+    "upload": "ASL Upload Prediction History",
+    "live": "ASL Live Prediction History",
+    "word": "ASL Word Maker History",
+}
+
+_IMAGES = None
+_IMAGES_LOCK = threading.Lock()
+
+def _image_cache():
+    """JPEG thumbnail cache for PDF images (FPDF does not read WebP)."""
+    global _IMAGES
+    with _IMAGES_LOCK:
+        if _IMAGES is None:
+            _IMAGES = ThumbnailCache(REPORT_IMAGE_DIR, max_bytes=REPORT_IMAGE_MAX_BYTES, fmt="JPEG")
+        return _IMAGES
+
+def report_key(tab, records):
+    """
+    Cache key for a PDF: the tab and the ordered selected records, content
+    included, so a record edited in place (e.g. a re-chosen word) gets a new PDF.
+    """
+    h = hashlib.sha1(f"{tab}:".encode())
+    for record in records:
+        h.update(json.dumps(record, sort_keys=True, default=str).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _letter_label(letter):
+    return letter.get("label", "-") if isinstance(letter, dict) else str(letter)
+
+# ----------------------------
+# Report job
+# ----------------------------
+class PDFReport:
+    """
+    Builds one history PDF on a background thread.
+
+    Images are first scaled down to print size on the thumbnail pool (cached on
+    disk, so re-exports skip the decode), then the document is laid out and
+    written to REPORT_DIR. `progress` / `stage` can be polled from the UI.
+    resolve: callable(path, tab) -> existing image path or None.
+    """
+    def __init__(self, tab, records, path, resolve=None):
+        self.tab = tab
+        self.records = records
+        self.path = Path(path)
+        self.resolve = resolve or (lambda p, tab=None: p if p and Path(p).exists() else None)
+        self.error = None
+        self.unreadable = set()             # record image paths PIL could not decode
+        self.stage = "Queued"
+        self.steps = 0
+        self.total = len(records) + len(self._wanted_images())
+        self._done = threading.Event()
+
+        if self.path.exists():
+            self.steps = self.total
+            self.stage = "Done"
+            self._done.set()
+        else:
+            threading.Thread(target=self._run, name=f"report-{self.path.stem[:8]}", daemon=True).start()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def progress(self):
+        return 1.0 if not self.total else min(1.0, self.steps / self.total)
+
+    def _wanted_images(self):
+        """(path, px) pairs the document will embed."""
+        wanted = []
+        for record in self.records:
+            if self.tab == "word":
+                wanted += [(p, LETTER_PX) for p in record.get("images", []) if p]
+            elif record.get("image"):
+                wanted.append((record["image"], IMAGE_PX))
+        return wanted
+
+    def _run(self):
+        try:
+            self.stage = "Scaling images"
+            capture_store.flush()               # captures saved a moment ago may still be queued
+            scaled = self._prescale()
+            self.stage = "Writing PDF"
+            self._write(scaled)
+            self.stage = "Done"
+        except Exception as e:
+            self.error = e
+            self.stage = "Failed"
+        finally:
+            self._done.set()
+
+    def _prescale(self):
+        """{record image path: print-size JPEG, or None if missing/unreadable}."""
+        cache = _image_cache()
+        scaled, futures = {}, {}
+        for path, px in self._wanted_images():
+            source = self.resolve(path, tab=self.tab)
+            if source is None:
+                scaled[path] = None
+                self.steps += 1
+                continue
+            futures[cache.submit(source, px)] = path
+
+        for future in as_completed(futures):
+            try:
+                scaled[futures[future]] = future.result()
+            except Exception:
+                scaled[futures[future]] = None
+                self.unreadable.add(futures[future])
+            self.steps += 1
+        return scaled
+
+    def _write(self, scaled):
+        FPDF = lazy_import("fpdf").FPDF
+        pdf = FPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 16)
+        pdf.cell(0, 10, TITLES.get(self.tab, "ASL History"), ln=True, align="C")
+        pdf.ln(5)
+
+        for idx, record in enumerate(self.records, start=1):
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 8, f"Record {idx}", ln=True)
+            pdf.set_font("Arial", "", 12)
+            if self.tab == "word":
+                self._word_record(pdf, record, scaled)
+            else:
+                self._prediction_record(pdf, record, scaled)
+            pdf.ln(5)
+            self.steps += 1
+
+        REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        pdf.output(str(tmp))
+        os.replace(tmp, self.path)
+        _prune_reports()
+
+    def _image(self, pdf, scaled, path, width):
+        if path in self.unreadable:
+            pdf.cell(0, 7, "<Image could not be rendered>", ln=True)
+            return
+        image = scaled.get(path)
+        if image is None:
+            pdf.cell(0, 7, "<Image not found>", ln=True)
+            return
+        try:
+            pdf.image(str(image), w=width)
+        except Exception:
+            pdf.cell(0, 7, "<Image could not be rendered>", ln=True)
+
+    def _prediction_record(self, pdf, record, scaled):
+        pdf.cell(0, 7, f"File Name: {record.get('file','-')}", ln=True)
+        pdf.cell(0, 7, f"Timestamp: {record.get('timestamp','-')}", ln=True)
+
+        if record.get("image"):
+            self._image(pdf, scaled, record["image"], 100)
+
+        pdf.cell(0, 7, f"Prediction: {record.get('prediction','-')}", ln=True)
+        pdf.cell(0, 7, f"Confidence: {record.get('confidence',0):.2%}", ln=True)
+
+        if "top5" in record:
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 7, "Top-5 Predictions:", ln=True)
+            pdf.set_font("Arial", "", 11)
+            for feat in record["top5"]:
+                lbl = str(feat.get("label","-")).replace("—","-")
+                conf = feat.get("confidence",0)
+                pdf.cell(0, 6, f"  {lbl} - {conf:.2%}", ln=True)
+            pdf.set_font("Arial", "", 12)
+
+    def _word_record(self, pdf, record, scaled):
+        letters = record.get("letters", [])
+        pdf.cell(0, 7, f"Word: {record.get('word','-')}", ln=True)
+        pdf.cell(0, 7, f"Meaning: {record.get('meaning','-')}", ln=True)
+        pdf.cell(0, 7, f"No. of Letters: {len(letters)}", ln=True)
+
+        for i, img_path in enumerate(record.get("images", []), start=1):
+            label = _letter_label(letters[i-1]) if i <= len(letters) else "-"
+            pdf.cell(0, 7, f"Letter {i}: {label}", ln=True)
+            self._image(pdf, scaled, img_path, 50)
+
+def _prune_reports():
+    files = sorted(REPORT_DIR.glob("*.pdf"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in files[REPORT_MAX_FILES:]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+# ----------------------------
+# Job registry
+# ----------------------------
+_JOBS = LRUCache(REPORT_MAX_FILES)
+_JOBS_LOCK = threading.Lock()
+
+def get_report(tab, records, resolve=None):
+    """
+    PDFReport for this selection: the running/finished job if there is one,
+    the PDF on disk if it was built before, else a new background job.
+    """
+    key = f"{tab}-{report_key(tab, records)}"
+    with _JOBS_LOCK:
+        job = _JOBS.get(key)
+        if job is None or job.error is not None or (job.done and not job.path.exists()):
+            job = PDFReport(tab, records, REPORT_DIR / f"{key}.pdf", resolve=resolve)
+            _JOBS.put(key, job)
+        return job
@@ -4,7 +4,8 @@ from pathlib import Path
 from PIL import Image
 import streamlit as st
 from streamlit_autorefresh import st_autorefresh
-from fpdf import FPDF
+from utils.startup import lazy_import
+from utils.thumbnails import thumbnail, thumbnails
 import io
 import time
 
@@ -90,13 +91,13 @@ def show_gesture_page(group_name, chars):
         with target_col:
             st.markdown(f"### {char}")
             with st.spinner(f"📷 Loading examples for {char}..."):
-                images = load_gesture_images(char)
+                images = thumbnails(load_gesture_images(char), 240)
             if images:
                 img_cols = st.columns(len(images))  # show them side by side
                 for idx, (img_path, c) in enumerate(zip(images, img_cols)):
                     with c:
                         st.image(
-                            Image.open(img_path),
+                            img_path,
                             caption=f"{char} - Example {idx+1}",
                             use_container_width=True,
                         )
@@ -287,7 +288,7 @@ def show():
                 for idx, entry in enumerate(st.session_state.quiz_results, start=1):
                     col1, col2, col3, col4 = st.columns([1,1.5,1.5,1])
                     with col1:
-                        st.image(Image.open(entry["image"]), width=70)
+                        st.image(thumbnail(entry["image"], 140), width=70)
                     with col2:
                         st.markdown(f"**Prediction:** {entry['guess']}")
                     with col3:
@@ -301,7 +302,7 @@ def show():
                 # Generate PDF Button
                 # --------------------------
                 with st.spinner("📝 Generating quiz report PDF..."):
-                    pdf = FPDF()
+                    pdf = lazy_import("fpdf").FPDF()
                     pdf.set_auto_page_break(auto=True, margin=15)
                     pdf.add_page()
                     pdf.set_font("Arial", 'B', 16)
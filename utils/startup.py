@@ -0,0 +1,88 @@
+import sys
+import time
+import threading
+import importlib
+
+from contextlib import contextmanager
+
+# ------------------------------------------------
+# Startup timing: records how long each import and
+# each startup stage took, for the timing report.
+# ------------------------------------------------
+PROCESS_START = time.perf_counter()
+
+_TIMINGS = []
+_LOCK = threading.Lock()
+
+@contextmanager
+def timed(name, kind="stage"):
+    """Time the wrapped block and record it under `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _LOCK:
+            _TIMINGS.append({
+                "kind": kind,
+                "name": name,
+                "seconds": elapsed,
+                "at": start - PROCESS_START,
+                "thread": threading.current_thread().name,
+            })
+
+def lazy_import(name):
+    """Import a module on first use and record the import time."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with timed(name, kind="import"):
+        return importlib.import_module(name)
+
+def report():
+    """Return the recorded timings, ordered by start time."""
+    with _LOCK:
+        return sorted(_TIMINGS, key=lambda t: t["at"])
+
+def format_report():
+    lines = [f"{'kind':<7} {'name':<32} {'start':>8} {'took':>8}"]
+    for t in report():
+        lines.append(f"{t['kind']:<7} {t['name']:<32} {t['at']:>7.2f}s {t['seconds']:>7.2f}s")
+    return "\n".join(lines)
+
+# ----------------------------
+# Background loading
+# ----------------------------
+class BackgroundLoader:
+    """
+    Run `fn` on a daemon thread and hand out its result once it is ready,
+    so pages that don't need it can render in the meantime.
+    """
+    def __init__(self, fn, name):
+        self.name = name
+        self._fn = fn
+        self._result = None
+        self._error = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"load-{name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            with timed(self.name):
+                self._result = self._fn()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def ready(self):
+        return self._done.is_set()
+
+    def get(self, timeout=None):
+        """Block until loaded; re-raise the loader's exception if it failed."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{self.name} is still loading")
+        if self._error is not None:
+            raise self._error
+        return self._result
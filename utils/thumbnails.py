@@ -0,0 +1,149 @@
+import os
+import hashlib
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from PIL import Image, features
+
+# ----------------------------
+# Settings
+# ----------------------------
+THUMB_DIR = Path(".cache/thumbnails")
+THUMB_MAX_BYTES = 64 * 1024 * 1024          # on-disk budget, oldest thumbnails evicted first
+THUMB_WORKERS = 4
+THUMB_QUALITY = 80
+THUMB_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+_EXTENSIONS = {"WEBP": ".webp", "JPEG": ".jpg", "PNG": ".png"}
+
+# ----------------------------
+# Thumbnail Cache
+# ----------------------------
+class ThumbnailCache:
+    """
+    Disk cache of downscaled images for st.image.
+
+    A thumbnail is keyed on (source path, mtime, file size, box size), so an
+    edited or replaced capture gets a fresh one. Thumbnails are rendered once on
+    a thread pool (concurrent requests for the same key share the work) and the
+    directory is kept under `max_bytes` by evicting least recently used files.
+    """
+    def __init__(self, root=THUMB_DIR, max_bytes=THUMB_MAX_BYTES, workers=THUMB_WORKERS, fmt=THUMB_FORMAT):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.fmt = fmt
+        self.ext = _EXTENSIONS[fmt]
+        self.hits = 0
+        self.misses = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbs")
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        # name -> bytes, least recently used first
+        entries = sorted(
+            (e for e in os.scandir(self.root) if e.is_file() and e.name.endswith(self.ext)),
+            key=lambda e: e.stat().st_mtime,
+        )
+        self._index = OrderedDict((e.name, e.stat().st_size) for e in entries)
+        self._total = sum(self._index.values())
+
+    def _key(self, path, size):
+        st = os.stat(path)
+        raw = f"{Path(path).resolve()}|{st.st_mtime_ns}|{st.st_size}|{size}"
+        return hashlib.sha1(raw.encode()).hexdigest() + self.ext
+
+    def _render(self, path, name, size):
+        target = self.root / name
+        tmp = target.with_suffix(f".{threading.get_ident()}.tmp")
+        nbytes = None
+        try:
+            with Image.open(path) as img:
+                img.draft("RGB", (size, size))          # JPEG: decode at reduced scale
+                img.thumbnail((size, size), Image.LANCZOS)
+                if img.mode not in ("RGB", "L"):
+                    img = img.convert("RGB")
+                img.save(tmp, self.fmt, quality=THUMB_QUALITY)
+            os.replace(tmp, target)
+            nbytes = target.stat().st_size
+        finally:
+            # Leave "pending" and enter the index in one step, so a concurrent
+            # submit sees one or the other and never renders the key again
+            with self._lock:
+                self._pending.pop(name, None)
+                if nbytes is not None:
+                    self._total += nbytes - self._index.get(name, 0)
+                    self._index[name] = nbytes
+                    self._index.move_to_end(name)
+                    self._evict()
+        return str(target)
+
+    def _evict(self):
+        while self._total > self.max_bytes and len(self._index) > 1:
+            name, nbytes = self._index.popitem(last=False)
+            self._total -= nbytes
+            try:
+                (self.root / name).unlink()
+            except OSError:
+                pass
+
+    def submit(self, path, size):
+        """Future resolving to the thumbnail path of `path` fitted in a size x size box."""
+        name = self._key(path, size)
+        with self._lock:
+            if name in self._index:
+                self._index.move_to_end(name)
+                self.hits += 1
+                future = Future()
+                future.set_result(str(self.root / name))
+                return future
+            if name not in self._pending:
+                self.misses += 1
+                self._pending[name] = self._pool.submit(self._render, path, name, size)
+            return self._pending[name]
+
+    def get(self, path, size):
+        """Thumbnail path for one image, or the original path if it cannot be rendered."""
+        return self.many([path], size)[0]
+
+    def many(self, paths, size):
+        """Thumbnail paths for several images, rendered in parallel (None for missing files)."""
+        futures = []
+        for path in paths:
+            try:
+                futures.append(self.submit(path, size) if path else None)
+            except OSError:
+                futures.append(None)
+        results = []
+        for path, future in zip(paths, futures):
+            if future is None:
+                results.append(None)
+                continue
+            try:
+                results.append(future.result())
+            except Exception:
+                results.append(str(path))           # unreadable by PIL: let st.image try the original
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {"files": len(self._index), "bytes": self._total, "hits": self.hits, "misses": self.misses}
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+def get_thumbnails():
+    """Process-wide ThumbnailCache."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ThumbnailCache()
+        return _CACHE
+
+def thumbnail(path, size):
+    """Shortcut: thumbnail path for `path` (longest side <= `size` px), None if missing."""
+    return get_thumbnails().get(path, size)
+
+def thumbnails(paths, size):
+    return get_thumbnails().many(paths, size)
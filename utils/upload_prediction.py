@@ -1,26 +1,52 @@
 import streamlit as st
 from PIL import Image
+import io
 import math
+import hashlib
 from pathlib import Path
-from datetime import datetime
 
-from src.config import MODEL_PATH, CLASS_MAP_JSON 
-from src.infer import ASLClassifier 
+from src.cache import LRUCache
+from src.registry import get_classifier
+from utils.capture_store import put_bytes
 from utils.history import save_to_history
 
 # ---------------------------
 # --- Pathing and Loading ---
 # ---------------------------
-CAPTURE_DIR = Path("captures/upload")
-CAPTURE_DIR.mkdir(parents=True, exist_ok=True)
+# Predictions keyed by (image content hash, model version), shared across reruns and sessions
+PREDICTION_CACHE = LRUCache(maxsize=256)
 
 def load_classifier(): 
+    # Shared with the other pages; only loads on first use or when the model file changes
     with st.spinner("⚙️ Loading ASL Classifier... Please wait"):
-        return ASLClassifier(MODEL_PATH, CLASS_MAP_JSON)  
+        return get_classifier()
 
 # ------------------------
 # --- Prediction Logic ---
 # ------------------------
+def predict_cached(clf, uploaded_files):
+    """
+    Return [(key, {"result", "image"})] for the uploaded files. Only files not yet in
+    PREDICTION_CACHE are decoded, stored in the capture store and sent through one batched predict.
+    """
+    version = getattr(clf, "version", None)
+    keys = [(hashlib.sha1(f.getvalue()).hexdigest(), version) for f in uploaded_files]
+    entries = [PREDICTION_CACHE.get(k) for k in keys]
+
+    missing = [i for i, e in enumerate(entries) if e is None]
+    if missing:
+        images = [Image.open(io.BytesIO(uploaded_files[i].getvalue())) for i in missing]
+        with st.spinner("🔍 Running Predicting..."):
+            results = clf.predict_batch(images)
+
+        for i, image, result in zip(missing, images, results):
+            uploaded = uploaded_files[i]
+            suffix = Path(uploaded.name).suffix.lower() or ".jpg"
+            entries[i] = {"result": result, "image": put_bytes(uploaded.getvalue(), suffix)}
+            PREDICTION_CACHE.put(keys[i], entries[i])
+
+    return list(zip(keys, entries))
+
 def pred():
     clf = None 
     try: 
@@ -65,6 +91,7 @@ def pred():
         st.markdown("### 📂 Uploaded Images")
         if st.button("🗑️ Clear All Images", type="secondary"):
             st.session_state.uploaded_files = []
+            st.session_state.upload_recorded = set()
             st.session_state.file_uploader_key += 1 
             st.rerun()
 
@@ -98,26 +125,26 @@ def pred():
         end = start + per_page
         page_files = uploaded_files[start:end]
 
-        for uploaded in page_files:
-            image = Image.open(uploaded)
+        entries = predict_cached(clf, page_files)
+
+        if "upload_recorded" not in st.session_state:
+            st.session_state.upload_recorded = set()
 
-            img_filename = CAPTURE_DIR / f"{uploaded.name.split('.')[0]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-            image.save(img_filename)
+        for uploaded, (key, entry) in zip(page_files, entries):
+            pred_result = entry["result"]
+            img_filename = entry["image"]
 
             with st.container():
                 col1, col2 = st.columns([1, 2])
                 with col1:
-                    st.image(image, caption=uploaded.name, use_container_width=True)
+                    st.image(uploaded.getvalue(), caption=uploaded.name, use_container_width=True)
                 with col2:
-                    with st.spinner("🔍 Running Predicting..."): 
-                        pred_result = clf.predict(image) 
-
                     st.success(f"### ✅ Prediction: {pred_result['label']}")
                     st.write(f"**Confidence:** {pred_result['confidence']:.2%}") 
 
                     st.markdown("#### 🔝 Top-5 Predictions")
-                    probs = sorted(pred_result['probs'].items(), key=lambda x: x[1], reverse=True)[:5] 
-                    for k, v in probs:
+                    top5 = pred_result.top_k(5)
+                    for k, v in top5:
                         pc1, pc2 = st.columns([3, 7])
                         with pc1:
                             st.write(f"**{k}**")
@@ -129,10 +156,13 @@ def pred():
                 "file": uploaded.name,
                 "prediction": pred_result['label'],
                 "confidence": pred_result['confidence'],
-                "top5": [{"label": k, "confidence": v} for k,v in probs],
+                "top5": [{"label": k, "confidence": v} for k, v in top5],
                 "image": str(img_filename)
             }
-            save_to_history("upload", record)
+            # Reruns (paging, widget changes) show the same files again; record each once
+            if key not in st.session_state.upload_recorded:
+                save_to_history("upload", record)
+                st.session_state.upload_recorded.add(key)
             st.caption("All results are saved in history for later reference.")
             st.markdown("---")
 
@@ -1,73 +1,142 @@
+import uuid
 import streamlit as st
-import requests
+import numpy as np
 import cv2
 
 from datetime import datetime
-from PIL import Image
-from pathlib import Path
 from utils.live_camera import show_letter_capture
-from utils.history import save_to_history
-
-# ---------------------------
-# --- Pathing and Loading ---
-# ---------------------------
-CAPTURE_DIR = Path("captures/word_maker")
-CAPTURE_DIR.mkdir(parents=True, exist_ok=True)
+from utils.capture_store import put_image
+from utils.history import save_to_history, update_history
+from utils.dictionary import get_dictionary, LocalSource
+from src.spelling import Speller
 
 # ----------------------
-# --- Saving Records ---
+# --- Word Session ---
 # ----------------------
-def save_word_record():
-    final_word = "".join(st.session_state.letters)
-    meaning = lookup_word(final_word.lower())
-
-    image_files = []
-    for i, img in enumerate(st.session_state.images, start=1):
-        filename = CAPTURE_DIR / f"{final_word}_{i}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-        if hasattr(img, "shape"):
-            img_pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-        else:
-            img_pil = img
-        img_pil.save(filename, format="JPEG")
-        image_files.append(str(filename))
-
-    record = {
-        "word": final_word,
-        "meaning": meaning,
-        "letters": [{"label": l} for l in st.session_state.letters],
-        "images": image_files,
-        "file": f"{final_word}.jpg",
-        "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    with st.spinner("💾 Saving to history..."):
-        save_to_history("word", record)
+class WordSession:
+    """
+    One word being spelled, kept in st.session_state across reruns.
+
+    Holds the captured letters, frames and probability vectors under a stable
+    id. `save()` stores the letter images and the history record once; later
+    calls are no-ops unless something changed (`dirty`), in which case the same
+    history record is updated instead of a new one being appended.
+    """
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.letters = []
+        self.images = []
+        self.probs = []
+        self.word = None
+        self.meaning = None
+        self.candidates = None
+        self.image_paths = []
+        self.record = None
+        self.dirty = False
+
+    def add(self, letter, frame, probs=None):
+        self.letters.append(letter)
+        self.images.append(frame)
+        self.probs.append(probs)
+        self.candidates = None
+        self.dirty = True
+
+    def set_word(self, word, meaning):
+        if (word, meaning) != (self.word, self.meaning):
+            self.word, self.meaning = word, meaning
+            self.dirty = True
+
+    def save(self):
+        """Persist the word (images + history record) if it changed since the last save."""
+        if not self.dirty or self.word is None:
+            return
+        # Only frames captured since the last save are encoded/stored
+        for img in self.images[len(self.image_paths):]:
+            self.image_paths.append(put_image(img) if img is not None else None)
+
+        fields = {
+            "word": self.word,
+            "meaning": self.meaning,
+            "letters": [{"label": l} for l in self.letters],
+            "candidates": [{"word": c.word.upper(), "score": c.score} for c in self.candidates or []],
+            "images": [p for p in self.image_paths if p],
+            "file": f"{self.word}.jpg",
+            "session": self.id,
+        }
+        with st.spinner("💾 Saving to history..."):
+            if self.record is None:
+                self.record = {**fields, "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+                save_to_history("word", self.record)
+            else:
+                self.record.update(fields)
+                update_history(self.record["id"], self.record)
+        self.dirty = False
 
 # -------------------------
 # --- Dictionary Lookup ---
 # -------------------------
 def lookup_word(word: str) -> str:
     """
-    Fetch word meaning from Free Dictionary API.
+    Word meaning from the configured dictionary (DICTIONARY_SOURCE in src/config.py):
+    the bundled offline index first, cached remote lookups as fallback.
+    """
+    with st.spinner("📖 Looking up meaning..."):
+        return get_dictionary().lookup(word)
+
+# ------------------------
+# --- Lexicon Decoding ---
+# ------------------------
+@st.cache_resource
+def load_speller():
+    """Beam-search speller over the local dictionary's words (None without a word list)."""
+    words = LocalSource().words()
+    return Speller(words) if words else None
+
+def _letter_probs(session, class_names):
+    """One probability vector per captured letter (one-hot where none was kept)."""
+    vectors = []
+    for letter, probs in zip(session.letters, session.probs):
+        if probs is None:
+            probs = np.zeros(len(class_names), dtype=np.float32)
+            probs[class_names.index(letter)] = 1.0
+        vectors.append(probs)
+    return np.stack(vectors)
+
+def choose_word(clf, session):
     """
-    url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-    try:
-        with st.spinner("📖 Looking up meaning..."):
-            response = requests.get(url, timeout=5).json()
-        if isinstance(response, list) and "meanings" in response[0]:
-            return response[0]["meanings"][0]["definitions"][0]["definition"]
-        return "No valid meaning found (possibly gibberish)."
-    except Exception:
-        return "⚠️ Error while fetching meaning."
+    Rank words for the captured letters and let the user pick one. The word as
+    signed is preselected unless the speller is confident in a correction.
+    Returns the chosen word; falls back to the letters as captured.
+    """
+    spelled = "".join(session.letters)
+    speller = load_speller()
+    if speller is None:
+        return spelled
+
+    if session.candidates is None:
+        session.candidates = speller.decode(_letter_probs(session, clf.class_names), clf.class_names)
+    candidates = session.candidates
+    if not candidates:
+        return spelled
+
+    scores = np.array([c.score for c in candidates])
+    shares = np.exp(scores - scores.max())
+    shares /= shares.sum()
+    labels = {
+        c.word.upper(): f"{c.word.upper()} ({share:.0%})" + (" · as signed" if c.signed else "")
+        for c, share in zip(candidates, shares)
+    }
+    return st.radio("🔤 Best matching words", list(labels), index=0, format_func=labels.get,
+                    key=f"word_choice_{session.id}")
 
 # ------------------------------
 # --- Letter Capture Display ---
 # ------------------------------
-def display_captures():
+def display_captures(session):
     """Show all captured letters with images + predictions."""
     st.subheader("📷 Captured Letters")
 
-    for i, (letter, img) in enumerate(zip(st.session_state.letters, st.session_state.images)):
+    for i, (letter, img) in enumerate(zip(session.letters, session.images)):
         label = ["First", "Second", "Third", "Fourth", "Fifth"][i] if i < 5 else f"{i+1}th"
 
         with st.container():
@@ -93,70 +162,45 @@ def show(clf):
     st.title("📝 ASL Word Maker")
     st.caption("Spell words in ASL and get instant definitions!")
 
-    if "letters" not in st.session_state:
-        st.session_state.letters = []
-    if "images" not in st.session_state:
-        st.session_state.images = []
-    if "current_capture" not in st.session_state:
-        st.session_state.current_capture = None 
+    if "word_session" not in st.session_state:
+        st.session_state.word_session = WordSession()
+    session = st.session_state.word_session
 
     st.subheader("⚙️ Settings")
     num_letters = st.number_input("Word length (Max. 18 Characters)", min_value=1, max_value=18, step=1)
+    auto_capture = st.checkbox("✋ Auto-capture letters when the sign is held steady", value=False)
 
     if st.button("🔄 Reset"):
-        st.session_state.letters.clear()
-        st.session_state.images.clear()
-        st.session_state.current_capture = None
+        st.session_state.word_session = WordSession()
         st.success("✅ Word builder reset!")
         st.rerun()
         
-    if len(st.session_state.letters) < num_letters:
-        st.info(f"👉 Capture letter **{len(st.session_state.letters) + 1} of {num_letters}**")
+    if len(session.letters) < num_letters:
+        st.info(f"👉 Capture letter **{len(session.letters) + 1} of {num_letters}**")
         
         with st.spinner("📸 Waiting for capture..."):
-            captured = show_letter_capture(clf) 
+            captured = show_letter_capture(clf, auto_capture=auto_capture)
 
         if captured:
-            letter, frame = captured
+            letter, frame, probs = captured
             if letter and frame is not None:
-                st.session_state.letters.append(letter)
-                st.session_state.images.append(frame)
+                session.add(letter, frame, probs)
                 st.success(f"✅ Captured: {letter}")
     else:
         st.success("🎉 All letters captured!")
 
-    if st.session_state.letters:
-        display_captures()
+    if session.letters:
+        display_captures(session)
 
-    if len(st.session_state.letters) == num_letters:
-        final_word = "".join(st.session_state.letters)
-        
+    if len(session.letters) == num_letters:
         st.markdown("---")
         st.subheader("✨ Final Result")
-        
+
+        final_word = choose_word(clf, session)
         st.success(f"📝 Word: **{final_word}**")
         meaning = lookup_word(final_word.lower())
         st.info(f"📖 Meaning: {meaning}")
 
-        image_paths = []
-        for i, (letter, img) in enumerate(zip(st.session_state.letters, st.session_state.images), start=1):
-            img_filename = f"{final_word}_{i}_{letter}.jpg"  
-            img_path = CAPTURE_DIR / img_filename
-
-            if hasattr(img, "shape"):
-                img_pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-            else:
-                img_pil = img
-
-            img_pil.save(img_path, format="JPEG")
-            image_paths.append(str(img_path))
-
-        word_record = {
-            "word": final_word,
-            "meaning": meaning,
-            "letters": [{"label": l} for l in st.session_state.letters],
-            "images": image_paths,
-            "file": f"{final_word}.jpg",
-            "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        save_to_history("word", word_record)
\ No newline at end of file
+        # Saved once per word; picking another candidate updates the same record
+        session.set_word(final_word, meaning)
+        session.save()
\ No newline at end of file